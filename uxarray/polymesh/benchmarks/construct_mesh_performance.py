@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import uxarray as ux
+
+module_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if module_path not in sys.path:
+    sys.path.append(module_path + "/polymesh")
+
+from polymesh import Polymesh
+
+data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+grids = {'outCSne30': data_path + "/misc/data/outCSne30.ug",
+         'x1.655362': data_path + "/mpas/data/x1.655362.grid_subset.scrip.nc"}
+
+
+def test(mesh, method, n_runs=10):
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        mesh.construct_mesh(method=method)
+    return (time.perf_counter() - start) / n_runs
+
+
+for name, path in grids.items():
+    try:
+        grid_ds = ux.open_dataset(path)
+    except Exception as e:
+        print("{}: unable to open grid ({})".format(name, e))
+        continue
+
+    mesh = Polymesh(grid_ds)
+
+    # Both builders must produce the same geometry buffers
+    mesh.construct_mesh(method='pygeos')
+    pygeos_geometry = mesh.gdf['geometry'].values
+    mesh.construct_mesh(method='arrow')
+    assert mesh.gdf['geometry'].values.data.equals(pygeos_geometry.data)
+
+    t_pygeos = test(mesh, 'pygeos')
+    t_arrow = test(mesh, 'arrow')
+    print("{}: {} faces, pygeos {:.4f}s, arrow {:.4f}s, speedup {:.1f}x".format(
+        name, mesh.n_faces, t_pygeos, t_arrow, t_pygeos / t_arrow))
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import numpy as np
+import cartopy.crs as ccrs
+import datashader as ds
+import uxarray as ux
+
+module_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if module_path not in sys.path:
+    sys.path.append(module_path + "/polymesh")
+
+from polymesh import Polymesh
+
+data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+grids = {'outCSne30': data_path + "/misc/data/outCSne30.ug",
+         'outRLL1deg': data_path + "/misc/data/outRLL1deg.ug",
+         'x1.655362': data_path + "/mpas/data/x1.655362.grid_subset.scrip.nc"}
+width, height = 800, 400
+
+
+def test(func, n_runs=5):
+    func()
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        result = func()
+    return (time.perf_counter() - start) / n_runs, result
+
+
+for name, path in grids.items():
+    try:
+        grid_ds = ux.open_dataset(path)
+    except Exception as e:
+        print("{}: unable to open grid ({})".format(name, e))
+        continue
+
+    # Random node values
+    node_dim = grid_ds.ds[grid_ds.ds_var_names['Mesh2_node_x']].dims[0]
+    grid_ds.ds['random'] = (node_dim, np.random.rand(grid_ds.ds.sizes[node_dim]))
+
+    mesh = Polymesh(grid_ds, projection=ccrs.Robinson())
+    mesh.construct_mesh()
+    df = mesh.data_mesh('random', {})
+
+    coords, _ = mesh.rendered_polygons()
+    coords = coords[np.all(np.isfinite(coords), axis=1)]
+    x_range = (coords[:, 0].min(), coords[:, 0].max())
+    y_range = (coords[:, 1].min(), coords[:, 1].max())
+    canvas = ds.Canvas(width, height, x_range=x_range, y_range=y_range)
+
+    for agg in ['mean', 'min', 'max', 'first']:
+        t_ds, ds_image = test(lambda: canvas.polygons(df, 'geometry', agg=getattr(ds, agg)('faces')).values)
+        t_np, np_image = test(lambda: mesh.rasterize('random', {}, width, height, x_range, y_range, agg=agg))
+
+        # Fraction of pixels covered by both that agree
+        covered = ~np.isnan(ds_image) & ~np.isnan(np_image)
+        match = np.mean(np.isclose(ds_image[covered], np_image[covered]))
+        print("{} ({}): datashader {:.4f}s, rasterize {:.4f}s, speedup {:.1f}x, {:.2%} matching pixels".format(
+            name, agg, t_ds, t_np, t_ds / t_np, match))
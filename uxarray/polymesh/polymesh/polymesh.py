@@ -1,16 +1,29 @@
+import os
+import time
+import json
+import hashlib
+import tempfile
+import warnings
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
+import pandas as pd
 import xarray as xr
 import spatialpandas as sp
 import cartopy.crs as ccrs
 import pygeos as pg
 import pyarrow as pa
+import scipy.sparse
 
 
 
 
 
 class Polymesh():
-    def __init__(self, ugrid=None, projection=ccrs.PlateCarree()):
+    def __init__(self, ugrid=None, projection=ccrs.PlateCarree(), cache_dir=None, cache_max_bytes=2**30,
+                 transform_workers=1, transform_pool='thread', transform_chunk_size=2**16, dtype=np.float64,
+                 geometry='polygons', profile=False, profile_callback=None):
         """ Given a UXarray grid object, constructs a polygon
         mesh suitable for rendering with Datashader
         Parameters
@@ -19,6 +32,31 @@ class Polymesh():
             Grid file name is the first argument.
         projection : ccrs., optional
             Cartopy projection for coordinate transform
+        cache_dir : string, optional
+            Directory for caching the constructed geometry on disk,
+            disabled when None
+        cache_max_bytes : int, optional
+            Maximum size of the geometry cache, least recently used
+            entries are evicted first
+        transform_workers : int, optional
+            Number of workers for the projection transform
+        transform_pool : string, optional
+            'thread' or 'process' pool for the projection transform
+        transform_chunk_size : int, optional
+            Number of coordinates transformed per chunk
+        dtype : np.dtype, optional
+            Floating point type of the polygon coordinates, np.float32
+            halves the memory of the mesh geometry
+        geometry : string, optional
+            'polygons' for a polygon mesh, or 'points' for face centroids
+            only (rendered with Datashader's points aggregation), which
+            skips cyclic polygon detection and splitting
+        profile : bool, optional
+            Records the wall time, peak traced memory and array bytes
+            of each construction stage in profile_records
+        profile_callback : callable, optional
+            Called with each stage record as it completes, enables
+            profiling
 
         Returns
         -------
@@ -33,30 +71,142 @@ class Polymesh():
 
         # Dictonary for Variables (remove on next UXarray Release)
         var_dict = ugrid.ds_var_names
+        self.var_dict = var_dict
+
+        # Stage Profiling of Mesh Construction
+        self.profile = profile or profile_callback is not None
+        self.profile_callback = profile_callback
+        self.profile_records = []
 
         # Projection for Coordinate Transform
         self.projection = projection
+        self.transform_workers = transform_workers
+        self.transform_pool = transform_pool
+        self.transform_chunk_size = transform_chunk_size
 
         self.ds = ugrid.ds
-        self.face_nodes = self.ds[var_dict['Mesh2_face_nodes']].values
+        face_nodes = self.ds[var_dict['Mesh2_face_nodes']]
+        self.face_nodes = face_nodes.values
         self.n_faces, self.n_face_nodes = self.face_nodes.shape
 
-        # Face Node Index for Construction Polygons
-        self.index = self.face_nodes.astype(int)
+        # Ragged Face Node Connectivity (excludes fill values)
+        fill_value = face_nodes.attrs.get('_FillValue', face_nodes.encoding.get('_FillValue'))
+        valid = _valid_face_nodes(self.face_nodes, fill_value)
+        self.face_node_counts = valid.sum(axis=1)
+        self.face_offsets = _counts_to_offsets(self.face_node_counts)
+
+        # Flat Face Node Index for Construction Polygons
+        self.index = self.face_nodes[valid].astype(int)
 
         # Original x and y coordinates
-        x = self.ds[var_dict['Mesh2_node_x']].values
-        y = self.ds[var_dict['Mesh2_node_y']].values
+        self.dtype = np.dtype(dtype)
+        x = self.ds[var_dict['Mesh2_node_x']].values.astype(self.dtype, copy=False)
+        y = self.ds[var_dict['Mesh2_node_y']].values.astype(self.dtype, copy=False)
+        self.n_nodes = x.shape[0]
+
+        # Dimension Names of Node and Face Data
+        self.node_dim = self.ds[var_dict['Mesh2_node_x']].dims[0]
+        self.face_dim = face_nodes.dims[0]
+
+        # Load Geometry from the Cache (keyed by grid content and projection)
+        self.geometry = geometry
+        self.cache = None
+        self._cached_geometry = None
+        entry = None
+        if cache_dir is not None and self.geometry == 'polygons':
+            self.cache = GeometryCache(cache_dir, cache_max_bytes)
+            self.cache_key = self.cache.key(x, y, self.face_nodes, projection=self.projection)
+            entry = self.cache.load(self.cache_key)
+
+            # Entries without the lon/lat polygons cannot be reprojected
+            if entry is not None and 'polygon_lonlat' not in entry:
+                entry = None
+
+        if self.geometry == 'points':
+            # Projected Face Centroids (no polygons to fix)
+            with self._profile_stage('projection') as stage:
+                self.face_coords = self.face_centroids(x, y, var_dict)
+                stage['nbytes'] = self.face_coords.nbytes
+            self.drop_index = np.array([], dtype=int)
+            self.missing_index = np.array([], dtype=int)
+            self.polygon_coords, self.polygon_offsets, self.new_poly_index = None, None, None
+
+        elif entry is not None:
+            self.drop_index = entry['drop_index']
+            self.missing_index = entry['missing_index']
+            self.polygon_coords = entry['polygon_coords'].reshape(-1, 2)
+            self.polygon_lonlat = entry['polygon_lonlat'].reshape(-1, 2)
+            self.polygon_offsets = entry['polygon_offsets']
+            self.new_poly_index = entry['new_poly_index']
+            self._cached_geometry = entry['geometry']
+
+        else:
+            # Get Polygon Coordinate Data (gathered once)
+            with self._profile_stage('gather') as stage:
+                poly_x = x[self.index]
+                poly_y = y[self.index]
+                stage['nbytes'] = poly_x.nbytes + poly_y.nbytes
+
+            # Calculate Index for Cyclic Cells based on Pre-Projection polygons
+            with self._profile_stage('cyclic') as stage:
+                self.drop_index = self.find_cyclic_polygons(poly_x)
+                stage['nbytes'] = self.drop_index.nbytes
+
+            # Index of Cyclic Cells that could not be split
+            self.missing_index = np.array([], dtype=int)
+
+            # Create Ragged Polygon Coordinates with Fixed Polygons
+            self.polygon_coords, self.polygon_offsets, self.new_poly_index = self.create_polygon_array(poly_x, poly_y)
+
+        # Face Index of each Rendered Polygon (Excluding Cyclic Cells)
+        if self.new_poly_index is not None:
+            self.polygon_face_index = np.concatenate((np.delete(np.arange(self.n_faces), self.drop_index),
+                                                      self.new_poly_index))
+        else:
+            self.polygon_face_index = np.arange(self.n_faces)
+
+        self._init_lazy_state()
+
+    def _init_lazy_state(self):
+        """ Initializes the structures that are built on first use"""
 
-        # Calculate Index for Cyclic Cells based on Pre-Projection polygons
-        self.drop_index = self.find_cyclic_polygons(x, y)
+        # Sparse Node to Face Operator, built on first use
+        self.node_operator = None
 
-        # Create Polygon Array with Fixed Polygons
-        self.polygon_array, self.new_poly_index = self.create_polygon_array(x, y)
+        # Reducer Operators, Face Edges and Face Geometry, built on first use
+        self.face_operators = {}
+        self.face_edges = None
+        self.face_geometry = None
 
+        # Level of Detail Pyramid, built on first use
+        self.pyramid = None
 
+        # Spatial Index of the Rendered Polygons, built on first use
+        self.spatial_index = None
 
-    def data_mesh(self, name, dims, fill='nodes'):
+        # Hilbert Sorted Partitions of the Rendered Polygons, built on first use
+        self.partitions = None
+
+        # Projected Geometry of previously used projections, filled by reproject
+        self.projections = {}
+
+    @property
+    def polygon_array(self):
+        """ Dense [n_polygons, n_face_nodes, 2] view of the polygon
+        coordinates, with faces that have fewer nodes padded by
+        repeating their last node
+        """
+        counts = np.diff(self.polygon_offsets)
+
+        # All Polygons have the same number of nodes (no copy)
+        if np.all(counts == self.n_face_nodes):
+            return self.polygon_coords.reshape(-1, self.n_face_nodes, 2)
+
+        node_index = np.minimum(np.arange(self.n_face_nodes), counts[:, np.newaxis] - 1)
+        return self.polygon_coords[self.polygon_offsets[:-1, np.newaxis] + node_index]
+
+
+    def data_mesh(self, name, dims, fill='nodes', lazy=False, npartitions=None, reducer='mean'):
         """ Given a Variable Name and Dimensions, returns a
         GeoDataFrame containing geometry and fill values for
         the polygon mesh
@@ -67,11 +217,19 @@ class Polymesh():
         dims : dict, required
             Dictonary of dimensions for data variable
         fill : string
-            Method for calculating face values
+            Location of the data, 'nodes', 'edges' or 'faces'
+        lazy : bool, optional
+            Return a DaskGeoDataFrame whose face values are computed
+            partition by partition, without loading the variable
+        npartitions : int, optional
+            Number of partitions when lazy, defaults to the CPU count
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values, see
+            REDUCERS, or a function of the gathered values and offsets
 
         Returns
         -------
-        gdf : GeoDataFrame
+        gdf : GeoDataFrame or DaskGeoDataFrame
             Contains polygon geometry and face values
         """
 
@@ -81,43 +239,440 @@ class Polymesh():
             print("Invalid Data Variable")
             return
 
+        if lazy:
+            return self._lazy_data_mesh(name, dims, fill, npartitions, reducer)
+
+        # Face Values Excluding Cyclic Cells
+        face_array = self.face_values(name, dims, fill, reducer=reducer)
+        self.gdf = self.gdf.assign(faces = face_array)
+
+        return self.gdf
+
+    def face_values(self, name, dims, fill='nodes', lazy=False, npartitions=None, reducer='mean'):
+        """ Given a Variable Name and Dimensions, returns the
+        value of each rendered polygon. Dimensions that remain
+        after selection (i.e. a slice of time steps) are kept as
+        trailing columns and reduced in a single call
+        Parameters
+        ----------
+        name : string, required
+            Name of data variable for rendering
+        dims : dict, required
+            Dictonary of dimensions for data variable
+        fill : string
+            Location of the data, 'nodes', 'edges' or 'faces'
+        lazy : bool, optional
+            Return a dask array chunked along the rendered polygons,
+            without loading the variable
+        npartitions : int, optional
+            Number of polygon chunks when lazy, defaults to the CPU count
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values, see
+            REDUCERS, or a function of the gathered values and offsets
+
+        Returns
+        -------
+        face_array : ndarray or dask.array.Array
+            Face values [n_polygons] or [n_polygons x ...]
+        """
+
+        data = self.ds[name].isel(dims)
+        if lazy:
+            return self._lazy_face_values(data, fill, npartitions, reducer)
+
+        return self._reduce_face_values(data, fill, reducer)
+
+    def _reduce_face_values(self, data, fill, reducer='mean'):
+        """ Reduces selected face, node or edge data to the value
+        of each rendered polygon
+        """
 
         # Data is given for every 'face'
         if fill == 'faces':
-            face_array = self.ds[name].isel(dims).values
+            values = data.transpose(self.face_dim, ...).values
+            face_array = values[self.polygon_face_index]
 
-        # Data is given for every 'face node'
-        elif fill == 'nodes':
-            face_array = np.zeros((self.polygon_array.shape[0]))
-            # Face Values for Original Polygons
-            face_array[:self.n_faces] = self.ds[name].isel(dims).values[self.index].mean(axis=1)
+        # Data is given for every 'face node' or 'face edge'
+        else:
+            values = data.transpose(self._element_dim(fill), ...).values
+            func, args = self._face_reducer(fill, reducer, 0, self.polygon_face_index.shape[0])
+            face_array = func(values, *args)
+
+        return face_array
+
+    def _element_dim(self, fill):
+        """ Returns the dimension name of node or edge data"""
+        if fill == 'nodes':
+            return self.node_dim
+        if fill == 'edges':
+            return self.face_edge_index()[1]
+        raise ValueError("Invalid fill '{}', expected 'nodes', 'edges' or 'faces'".format(fill))
+
+    def _face_reducer(self, fill, reducer, start, stop):
+        """ Returns a function and its arguments that reduce node or edge
+        values [n_elements x ...] to the values of rendered polygons
+        start to stop, without per face loops
+        """
 
-            # Face Values for New (Left & Right) Polygons
-            if self.new_poly_index is not None:
-                face_array[self.n_faces:] = face_array[self.new_poly_index]
+        # Sparse (weighted) mean operator
+        if isinstance(reducer, str) and reducer in _OPERATOR_WEIGHTS:
+            return _apply_operator, (self.face_operator(fill, reducer)[start:stop],)
 
-        else:
-            self.face_array = None
+        # Value of the element closest to each face's center
+        if isinstance(reducer, str) and reducer == 'nearest':
+            return _take_rows, (self.nearest_element(fill)[start:stop],)
 
-        # Face Values Excluding Cyclic Cells
-        if self.new_poly_index is not None:
-            updated_faces = np.delete(face_array, self.drop_index, axis=0)
-            self.gdf = self.gdf.assign(faces = updated_faces)
+        # Reduction of the gathered ragged values of each polygon
+        if isinstance(reducer, str):
+            if reducer not in REDUCERS:
+                raise ValueError("Invalid reducer '{}', expected one of {}".format(
+                    reducer, sorted(set(REDUCERS) | set(_OPERATOR_WEIGHTS) | {'nearest'})))
+            reducer = REDUCERS[reducer]
+
+        element_index, offsets = self._polygon_elements(fill, start, stop)
+        return _reduce_ragged, (reducer, element_index, offsets)
+
+    def _polygon_partitions(self, npartitions=None):
+        """ Returns the bounds [0, ..., n_polygons] of contiguous
+        partitions of the rendered polygons
+        """
+        n_polygons = self.polygon_face_index.shape[0]
+        if npartitions is None:
+            npartitions = os.cpu_count() or 1
+        npartitions = max(1, min(npartitions, n_polygons))
+        return np.linspace(0, n_polygons, npartitions + 1).astype(np.int64)
+
+    def _lazy_face_values(self, data, fill, npartitions=None, reducer='mean'):
+        """ Builds a dask graph reducing selected face, node or edge data
+        to the value of each rendered polygon, chunked along the rendered
+        polygons and along any remaining (i.e. level) dimension
+        """
+        import dask.array as da
+
+        bounds = self._polygon_partitions(npartitions)
+        row_chunks = tuple(np.diff(bounds))
+
+        # Data is given for every 'face'
+        if fill == 'faces':
+            values = da.asarray(data.transpose(self.face_dim, ...).data)
+            face_array = values[self.polygon_face_index].rechunk({0: row_chunks})
+
+        # Data is given for every 'face node' or 'face edge'
         else:
-            self.gdf = self.gdf.assign(faces = face_array)
+            # Faces may reference any element, so each task reads every
+            # element of a single chunk of the remaining dimensions
+            values = da.asarray(data.transpose(self._element_dim(fill), ...).data).rechunk({0: -1})
+            dtype = _reducer_dtype(reducer, values.dtype)
+
+            blocks = []
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                func, args = self._face_reducer(fill, reducer, start, stop)
+                blocks.append(values.map_blocks(func, *args, chunks=((stop - start,),) + values.chunks[1:],
+                                                dtype=dtype))
+            face_array = da.concatenate(blocks, axis=0)
+
+        return face_array
+
+    def _lazy_data_mesh(self, name, dims, fill, npartitions=None, reducer='mean'):
+        """ Builds a DaskGeoDataFrame with one partition per chunk of
+        lazily computed face values, sharing the mesh geometry
+        """
+        import dask.dataframe as dd
+        from dask import delayed
 
-        return self.gdf
+        face_array = self.face_values(name, dims, fill, lazy=True, npartitions=npartitions, reducer=reducer)
+        if face_array.ndim != 1:
+            raise ValueError("dims must select a single index of every non spatial dimension")
+
+        bounds = self._polygon_partitions(npartitions)
+        geometry = self.gdf['geometry'].values
+
+        partitions = []
+        for start, stop, face_block in zip(bounds[:-1], bounds[1:], face_array.to_delayed().ravel()):
+            partitions.append(delayed(_geometry_partition)(geometry[start:stop], face_block, start))
+
+        meta = sp.GeoDataFrame({'geometry': geometry[:0], 'faces': np.zeros(0, dtype=face_array.dtype)})
+        divisions = tuple(bounds[:-1]) + (bounds[-1] - 1,)
+
+        return dd.from_delayed(partitions, meta=meta, divisions=divisions)
+
+    def iter_frames(self, name, dim, dims=None, fill='nodes', chunk_size=24, gdf=True, reducer='mean'):
+        """ Given a Variable Name and a Dimension, yields the face
+        values of each step along that dimension (i.e. animation
+        frames). Data is read and reduced in chunks, with the next
+        chunk read in a background thread while the current chunk's
+        frames are rendered
+        Parameters
+        ----------
+        name : string, required
+            Name of data variable for rendering
+        dim : string, required
+            Dimension to iterate over (i.e. 'time')
+        dims : dict, optional
+            Dictonary of other dimensions for data variable
+        fill : string
+            Location of the data, 'nodes', 'edges' or 'faces'
+        chunk_size : int, optional
+            Number of steps read and reduced at once
+        gdf : bool, optional
+            Yield GeoDataFrames sharing the mesh geometry (requires
+            construct_mesh), otherwise yield face value arrays
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values, see
+            REDUCERS, or a function of the gathered values and offsets
+
+        Yields
+        -------
+        frame : GeoDataFrame or ndarray
+            Polygon geometry and face values of a single step
+        """
+
+        # Ensure a valid variable name is passed through
+        if name not in list(self.ds.data_vars):
+            # add exception later
+            print("Invalid Data Variable")
+            return
+
+        data = self.ds[name]
+        if dims:
+            data = data.isel(dims)
+        n_steps = data.sizes[dim]
+
+        # Geometry shared by every frame (no copy of the Arrow buffers)
+        if gdf:
+            geometry = sp.GeoDataFrame({'geometry': self.gdf['geometry'].values})
+
+        def load(start):
+            chunk = data.isel({dim: slice(start, start + chunk_size)}).transpose(dim, ...)
+            return chunk.load()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(load, 0)
+            for start in range(0, n_steps, chunk_size):
+                chunk = future.result()
+
+                # Prefetch the next chunk while the current chunk is rendered
+                if start + chunk_size < n_steps:
+                    future = executor.submit(load, start + chunk_size)
+
+                # Reduce all steps in the chunk at once, one contiguous row per step
+                face_block = np.ascontiguousarray(np.moveaxis(self._reduce_face_values(chunk, fill, reducer), 1, 0))
+
+                for face_array in face_block:
+                    if gdf:
+                        frame = geometry.copy(deep=False)
+                        frame['faces'] = face_array
+                        yield frame
+                    else:
+                        yield face_array
+
+    def node_to_face_operator(self):
+        """ Builds (once) a sparse matrix that maps node values to
+        the mean node value of each rendered polygon, with the split
+        and dropped cyclic cells already applied
+
+        Returns
+        -------
+        node_operator : scipy.sparse.csr_matrix
+            Operator [n_polygons x n_nodes]
+        """
+
+        if self.node_operator is None:
+            self.node_operator = self.face_operator('nodes', 'mean')
+
+        return self.node_operator
+
+    def face_operator(self, fill='nodes', reducer='mean'):
+        """ Builds (once) a sparse matrix that maps node or edge values
+        to the weighted mean of each rendered polygon, with rows
+        summing to one
+        Parameters
+        ----------
+        fill : string, optional
+            'nodes' or 'edges'
+        reducer : string, optional
+            'mean' (equal weights), 'area_mean' (weighted by the area
+            of the faces sharing each element) or 'length_mean'
+            (weighted by the length of the face edges at each element)
+
+        Returns
+        -------
+        operator : scipy.sparse.csr_matrix
+            Operator [n_polygons x n_elements]
+        """
 
+        key = (fill, reducer)
+        if key not in self.face_operators:
+            element_index, indptr = self._polygon_elements(fill)
+            node_index, _ = _ragged_take(self.face_offsets, self.polygon_face_index)
+
+            # Weight of each entry of the face connectivity
+            if reducer == 'mean':
+                weights = np.ones(self.index.shape[0])
+            elif reducer == 'area_mean':
+                geometry = self._face_geometry()
+                element = self.index if fill == 'nodes' else self.face_edge_index()[0]
+                counts = np.repeat(self.face_node_counts, self.face_node_counts)
+                element_area = np.bincount(element, np.repeat(geometry['area'], self.face_node_counts) / counts)
+                weights = element_area[element]
+            elif reducer == 'length_mean':
+                length = self._face_geometry()['length']
+                if fill == 'nodes':
+                    # Half of each edge meeting at the node
+                    weights = (length + length[self._previous_entry()]) / 2
+                else:
+                    weights = length
+            else:
+                raise ValueError("Invalid reducer '{}', expected one of {}".format(reducer, _OPERATOR_WEIGHTS))
+
+            # Normalize the weights of each rendered polygon
+            weights = weights[node_index]
+            totals = np.add.reduceat(weights, indptr[:-1])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                weights = weights / np.repeat(totals, np.diff(indptr))
+
+            n_elements = self.n_nodes if fill == 'nodes' else self.n_edges
+            self.face_operators[key] = scipy.sparse.csr_matrix((weights, element_index, indptr),
+                                                               shape=(self.polygon_face_index.shape[0], n_elements))
 
+        return self.face_operators[key]
 
+    def face_edge_index(self):
+        """ Maps (once) each entry of the face node connectivity to the
+        edge from that node to the next node of the face, using
+        Mesh2_edge_nodes
 
-    def construct_mesh(self):
+        Returns
+        -------
+        face_edges : ndarray
+            Edge index of each face node entry (ragged, as self.index)
+        edge_dim : string
+            Dimension name of edge data
+        """
+
+        if self.face_edges is None:
+            name = self.var_dict.get('Mesh2_edge_nodes', 'Mesh2_edge_nodes')
+            if name not in self.ds:
+                raise ValueError("Edge data requires '{}' in the grid".format(name))
+
+            edge_nodes = self.ds[name].values.astype(np.int64)
+            self.n_edges = edge_nodes.shape[0]
+            self.edge_dim = self.ds[name].dims[0]
+
+            # Order Independent Key of each Edge's Node Pair
+            edge_key = np.sort(edge_nodes, axis=1)
+            edge_key = edge_key[:, 0] * self.n_nodes + edge_key[:, 1]
+            order = np.argsort(edge_key)
+
+            face_key = np.sort(np.column_stack((self.index, self.index[self._next_entry()])), axis=1)
+            face_key = face_key[:, 0] * self.n_nodes + face_key[:, 1]
+
+            position = np.minimum(np.searchsorted(edge_key, face_key, sorter=order), self.n_edges - 1)
+            face_edges = order[position]
+            if np.any(edge_key[face_edges] != face_key):
+                raise ValueError("Face edges missing from '{}'".format(name))
+
+            self.face_edges = face_edges
+
+        return self.face_edges, self.edge_dim
+
+    def nearest_element(self, fill='nodes'):
+        """ Returns (once) the node, or edge midpoint, of each rendered
+        polygon's face that is closest to the face center
+
+        Returns
+        -------
+        nearest : ndarray
+            Node or edge index [n_polygons]
+        """
+
+        key = (fill, 'nearest')
+        if key not in self.face_operators:
+            geometry = self._face_geometry()
+            points = geometry['points']
+            if fill == 'edges':
+                points = (points + points[self._next_entry()]) / 2
+
+            # Distance of each entry to its face center
+            center = np.repeat(geometry['center'], self.face_node_counts, axis=0)
+            distance = np.linalg.norm(points - center, axis=1)
+
+            # First entry of each face with the smallest distance
+            face_index = np.repeat(np.arange(self.n_faces), self.face_node_counts)
+            closest = distance == np.repeat(np.minimum.reduceat(distance, self.face_offsets[:-1]),
+                                            self.face_node_counts)
+            entries = np.flatnonzero(closest)
+            _, first = np.unique(face_index[entries], return_index=True)
+
+            element = self.index if fill == 'nodes' else self.face_edge_index()[0]
+            self.face_operators[key] = element[entries[first]][self.polygon_face_index]
+
+        return self.face_operators[key]
+
+    def _polygon_elements(self, fill, start=0, stop=None):
+        """ Returns the node or edge index of every entry of rendered
+        polygons start to stop, and their offsets
+        """
+        entry_index, offsets = _ragged_take(self.face_offsets, self.polygon_face_index[start:stop])
+        element = self.index if fill == 'nodes' else self.face_edge_index()[0]
+        return element[entry_index], offsets
+
+    def _next_entry(self):
+        """ Index of the next entry of each face (wrapping to the first)"""
+        next_index = np.arange(1, self.index.shape[0] + 1)
+        next_index[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        return next_index
+
+    def _previous_entry(self):
+        """ Index of the previous entry of each face (wrapping to the last)"""
+        previous_index = np.arange(-1, self.index.shape[0] - 1)
+        previous_index[self.face_offsets[:-1]] = self.face_offsets[1:] - 1
+        return previous_index
+
+    def _face_geometry(self):
+        """ Computes (once) the unit sphere position of every face
+        node entry, the length of the edge to the next node, and the
+        center and area of each face, from the lon/lat grid
+        """
+
+        if self.face_geometry is None:
+            x = np.deg2rad(self.ds[self.var_dict['Mesh2_node_x']].values.astype(np.float64))
+            y = np.deg2rad(self.ds[self.var_dict['Mesh2_node_y']].values.astype(np.float64))
+            xyz = np.column_stack((np.cos(y) * np.cos(x), np.cos(y) * np.sin(x), np.sin(y)))
+
+            points = xyz[self.index]
+            next_points = points[self._next_entry()]
+
+            # Great Circle Edge Lengths
+            chord = np.linalg.norm(next_points - points, axis=1)
+            length = 2 * np.arcsin(np.minimum(chord / 2, 1))
+
+            # Face Areas (planar polygon through the nodes) and Centers
+            face_start = self.face_offsets[:-1]
+            area = np.linalg.norm(np.add.reduceat(np.cross(points, next_points), face_start), axis=1) / 2
+            center = np.add.reduceat(points, face_start)
+            center /= np.linalg.norm(center, axis=1, keepdims=True)
+
+            self.face_geometry = {'points': points, 'length': length, 'area': area, 'center': center}
+
+        return self.face_geometry
+
+    def construct_mesh(self, method='arrow'):
         """ Constructs a Polygon Mesh using the calculated
-        polygon array and drop index for cyclic polygons
+        polygon coordinates and drop index for cyclic polygons
+        Parameters
+        ----------
+        method : string, optional
+            'arrow' builds the geometry buffers directly from the
+            polygon coordinates, 'pygeos' builds them from PyGEOS
+            polygon objects
+
         Parameters (from class)
         ----------
-        polygon_array : ndarry
+        polygon_coords : ndarry
             Array containing Polygon Coordinates (original and new)
+        polygon_offsets : ndarray
+            Offsets of each Polygon into polygon_coords
         drop_index : ndarray
             Array containing indices to cyclic polygons
 
@@ -127,32 +682,72 @@ class Polymesh():
             Contains polygon geometry
         """
 
-        # Create PyGeos Polygon Object
-        if self.new_poly_index is not None:
-            geo = pg.polygons(np.delete(self.polygon_array, self.drop_index, axis=0))
-        else:
-            geo = pg.polygons(self.polygon_array)
-
-        # Get Coords and indicies for PyArrow
-        arr_flat, part_indices = pg.get_parts(geo, return_index=True)
-        offsets1 = np.insert(np.bincount(part_indices).cumsum(), 0, 0)
-        arr_flat2, ring_indices = pg.geometry.get_rings(arr_flat, return_index=True)
-        offsets2 = np.insert(np.bincount(ring_indices).cumsum(), 0, 0)
-        coords, indices = pg.get_coordinates(arr_flat2, return_index=True)
-        offsets3 = np.insert(np.bincount(indices).cumsum(), 0, 0)
-        coords_flat = coords.ravel()
-        offsets3 *= 2
+        # Face Centroid Points for Datashader's points aggregation
+        if self.geometry == 'points':
+            with self._profile_stage('dataframe') as stage:
+                self.gdf = pd.DataFrame({'x': self.face_coords[:, 0], 'y': self.face_coords[:, 1]})
+                stage['nbytes'] = int(self.gdf.memory_usage(index=False).sum())
+            return
 
-        # Create a PyArrow array with our Polygons
-        _parr3 = pa.ListArray.from_arrays(pa.array(offsets3), pa.array(coords_flat))
-        _parr2 = pa.ListArray.from_arrays(pa.array(offsets2), _parr3)
-        parr = pa.ListArray.from_arrays(pa.array(offsets1), _parr2)
+        # Geometry Loaded from the Cache
+        if self._cached_geometry is not None:
+            with self._profile_stage('geodataframe') as stage:
+                self.gdf = sp.GeoDataFrame({'geometry': sp.geometry.MultiPolygonArray(self._cached_geometry)})
+                stage['nbytes'] = self._cached_geometry.nbytes
+            return
 
-        # Create Spatial Pandas Polygon Objects from PyArrow
-        polygons = sp.geometry.MultiPolygonArray(parr)
+        # Polygons to Render (Excluding Cyclic Cells)
+        keep_coords, keep_offsets = self.rendered_polygons()
+
+        if method == 'arrow':
+            with self._profile_stage('arrow') as stage:
+                parr = _polygons_to_arrow(keep_coords, keep_offsets)
+                stage['nbytes'] = parr.nbytes
+
+        elif method == 'pygeos':
+            # Create PyGeos Polygon Object
+            with self._profile_stage('pygeos') as stage:
+                ring_index = np.repeat(np.arange(keep_offsets.shape[0] - 1), np.diff(keep_offsets))
+                geo = pg.polygons(pg.linearrings(keep_coords, indices=ring_index))
+                stage['nbytes'] = geo.nbytes
+
+            with self._profile_stage('arrow') as stage:
+                # Get Coords and indicies for PyArrow
+                arr_flat, part_indices = pg.get_parts(geo, return_index=True)
+                offsets1 = np.insert(np.bincount(part_indices).cumsum(), 0, 0)
+                arr_flat2, ring_indices = pg.geometry.get_rings(arr_flat, return_index=True)
+                offsets2 = np.insert(np.bincount(ring_indices).cumsum(), 0, 0)
+                coords, indices = pg.get_coordinates(arr_flat2, return_index=True)
+                offsets3 = np.insert(np.bincount(indices).cumsum(), 0, 0)
+                coords_flat = coords.ravel()
+                offsets3 *= 2
+
+                # Create a PyArrow array with our Polygons
+                _parr3 = pa.ListArray.from_arrays(pa.array(offsets3), pa.array(coords_flat))
+                _parr2 = pa.ListArray.from_arrays(pa.array(offsets2), _parr3)
+                parr = pa.ListArray.from_arrays(pa.array(offsets1), _parr2)
+                stage['nbytes'] = parr.nbytes
 
-        # Store our Polygon Geometry in a GeoDataFrame
-        self.gdf = sp.GeoDataFrame({'geometry': polygons})
+        else:
+            raise ValueError("Invalid method '{}', expected 'arrow' or 'pygeos'".format(method))
+
+        # Store Geometry in the Cache
+        if self.cache is not None:
+            self.cache.store(self.cache_key, {'drop_index': self.drop_index,
+                                              'missing_index': self.missing_index,
+                                              'polygon_coords': self.polygon_coords.ravel(),
+                                              'polygon_lonlat': self.polygon_lonlat.ravel(),
+                                              'polygon_offsets': self.polygon_offsets,
+                                              'new_poly_index': self.new_poly_index,
+                                              'geometry': parr})
+
+        with self._profile_stage('geodataframe') as stage:
+            # Create Spatial Pandas Polygon Objects from PyArrow
+            polygons = sp.geometry.MultiPolygonArray(parr)
+
+            # Store our Polygon Geometry in a GeoDataFrame
+            self.gdf = sp.GeoDataFrame({'geometry': polygons})
+            stage['nbytes'] = parr.nbytes
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ PyGeos + PGPD ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # x_coords = self.x[self.index]
@@ -168,158 +763,1550 @@ class Polymesh():
         # self.df = df.geos.to_geopandas(geometry='geometry')
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    def find_cyclic_polygons(self, x, y):
-        """ Finds cyclic polygons (longitude edges) and returns
-        their indicies
-        Parameters (from class)
+    def reproject(self, projection):
+        """ Changes the projection of the mesh, reusing the lon/lat
+        polygons (with cyclic polygons already split) so only the
+        coordinate transform and Arrow build are repeated. The projected
+        geometry of each projection is kept, so switching back to a
+        previous projection does not transform again
+        Parameters
         ----------
-        x : ndarry
-            coordinate values for 'x' coordinates
-        y : ndarray
-            coordinate values for 'y' coordinates
+        projection : ccrs., required
+            Cartopy projection for coordinate transform
 
         Returns
         -------
-        drop_index : ndarray
-            Array containing indices to cyclic polygons
+        object : Polymesh
+            This mesh, in the new projection
         """
 
-        # Get Polygon Coordinate Data
-        poly_data = np.zeros((self.n_faces, 2*self.n_face_nodes))
-        poly_data[:, 0::2] = x[self.index]
-        poly_data[:, 1::2] = y[self.index]
+        if projection.proj4_init == self.projection.proj4_init:
+            return self
 
-        # Find any polygon that has (+) & (-) x values
-        xs = poly_data[:, 0::2]
-        x_abs = np.abs(xs)
-        out_left = np.all((-xs - x_abs) == 0, axis=1)
-        out_right = np.all((xs - x_abs) == 0, axis=1)
-        out = out_left | out_right
+        # Keep the Projected Geometry of the Current Projection
+        names = ['polygon_coords', 'face_coords', 'gdf', 'pyramid', 'spatial_index', 'partitions', '_cached_geometry']
+        self.projections[self.projection.proj4_init] = {name: getattr(self, name) for name in names
+                                                        if hasattr(self, name)}
+        built = hasattr(self, 'gdf')
 
-        # Store Index of Cyclic Cells
-        drop_index = np.arange(0, self.n_faces, 1)
-        drop_index = drop_index[~out]
+        self.projection = projection
+        if self.cache is not None:
+            x = self.ds[self.var_dict['Mesh2_node_x']].values.astype(self.dtype, copy=False)
+            y = self.ds[self.var_dict['Mesh2_node_y']].values.astype(self.dtype, copy=False)
+            self.cache_key = self.cache.key(x, y, self.face_nodes, projection=self.projection)
+
+        # Previously Used Projection
+        state = self.projections.pop(projection.proj4_init, None)
+        if state is not None:
+            for name, value in state.items():
+                setattr(self, name, value)
+            return self
+
+        self.pyramid = None
+        self.spatial_index = None
+        self.partitions = None
+        self._cached_geometry = None
+
+        if self.geometry == 'points':
+            with self._profile_stage('projection') as stage:
+                self.face_coords = np.zeros(self.face_lonlat.shape, dtype=self.dtype)
+                self.transform_points(self.face_lonlat[:, 0], self.face_lonlat[:, 1], self.face_coords)
+                stage['nbytes'] = self.face_coords.nbytes
 
-        # Find all polygons between some (+) and (-) buffer
-        center_buffer = 80
-        poly_to_fix = poly_data[drop_index]
-        corrected_index = np.any(np.abs(poly_to_fix[:, ::2]) < center_buffer, axis=1)
+        else:
+            # Load Geometry from the Cache, otherwise transform the lon/lat polygons
+            entry = self.cache.load(self.cache_key) if self.cache is not None else None
+            if entry is not None and 'polygon_lonlat' in entry:
+                self.polygon_coords = entry['polygon_coords'].reshape(-1, 2)
+                self._cached_geometry = entry['geometry']
+            else:
+                self.polygon_coords = self.project_polygons()
 
-        # Update Cyclic Cells to exclude those center polygons
-        drop_index = drop_index[~corrected_index]
+        # Rebuild the Mesh if it was constructed in the previous projection
+        if built:
+            self.construct_mesh()
 
-        return drop_index
+        return self
 
+    def share(self, name, shared_dir=None):
+        """ Publishes the mesh geometry (coordinates, offsets and the
+        Arrow geometry column) and connectivity once as a memory mapped
+        Arrow file in shared memory, for worker processes to attach
+        read-only by name (see attach)
+        Parameters
+        ----------
+        name : string, required
+            Name of the shared mesh
+        shared_dir : string, optional
+            Directory of shared meshes, defaults to a private (0700)
+            per-user directory /dev/shm/polymesh-<uid> (POSIX shared
+            memory) when available
 
+        Returns
+        -------
+        name : string
+            Name of the shared mesh
+        """
 
-    def create_polygon_array(self, x, y):
-        """ Converts coordinate and face node data to
-        a polygon array, taking into account cyclic
-        polygons
-        Parameters (from class)
+        if not hasattr(self, 'gdf'):
+            self.construct_mesh()
+
+        entry = {'sizes': np.array([self.n_faces, self.n_face_nodes, self.n_nodes]),
+                 'projection': np.frombuffer(_projection_to_json(self.projection).encode(), dtype=np.uint8),
+                 'index': self.index,
+                 'face_offsets': self.face_offsets,
+                 'face_node_counts': self.face_node_counts,
+                 'polygon_face_index': self.polygon_face_index}
+
+        if self.geometry == 'points':
+            entry.update({'face_coords': self.face_coords.ravel(),
+                          'face_lonlat': self.face_lonlat.ravel()})
+        else:
+            entry.update({'drop_index': self.drop_index,
+                          'missing_index': self.missing_index,
+                          'polygon_coords': self.polygon_coords.ravel(),
+                          'polygon_offsets': self.polygon_offsets,
+                          'polygon_lonlat': self.polygon_lonlat.ravel(),
+                          'new_poly_index': self.new_poly_index,
+                          'geometry': self.gdf['geometry'].values.data})
+
+        # Shared meshes are removed with unshare, never evicted
+        GeometryCache(_shared_dir(shared_dir), max_bytes=float('inf')).store(name, entry)
+
+        return name
+
+    @classmethod
+    def attach(cls, name, ugrid=None, shared_dir=None):
+        """ Attaches read-only to a mesh published with share. The
+        geometry is memory mapped without copying, so only face values
+        are allocated by each process
+        Parameters
+        ----------
+        name : string, required
+            Name of the shared mesh
+        ugrid : uxarray grid object, optional
+            Grid containing the data variables for rendering
+        shared_dir : string, optional
+            Directory of shared meshes, defaults to /dev/shm/polymesh-<uid>
+
+        Returns
+        -------
+        object : Polymesh
+            Mesh sharing the published geometry
+        """
+
+        entry = GeometryCache(_shared_dir(shared_dir), max_bytes=float('inf')).load(name)
+        if entry is None:
+            raise ValueError("No shared mesh named '{}'".format(name))
+
+        self = cls.__new__(cls)
+        self.n_faces, self.n_face_nodes, self.n_nodes = (int(size) for size in entry['sizes'])
+        self.projection = _projection_from_json(entry['projection'].tobytes().decode())
+        self.transform_workers = 1
+        self.transform_pool = 'thread'
+        self.transform_chunk_size = 2**16
+        self.profile, self.profile_callback, self.profile_records = False, None, []
+        self.cache, self._cached_geometry = None, None
+
+        # Data Variables and their Dimension Names
+        self.ds, self.var_dict = None, {}
+        if ugrid is not None:
+            self.ds = ugrid.ds
+            self.var_dict = ugrid.ds_var_names
+            self.node_dim = self.ds[self.var_dict['Mesh2_node_x']].dims[0]
+            self.face_dim = self.ds[self.var_dict['Mesh2_face_nodes']].dims[0]
+
+        self.face_nodes = None
+        self.index = entry['index']
+        self.face_offsets = entry['face_offsets']
+        self.face_node_counts = entry['face_node_counts']
+        self.polygon_face_index = entry['polygon_face_index']
+
+        if 'face_coords' in entry:
+            self.geometry = 'points'
+            self.face_coords = entry['face_coords'].reshape(-1, 2)
+            self.face_lonlat = entry['face_lonlat'].reshape(-1, 2)
+            self.dtype = self.face_coords.dtype
+            self.drop_index = np.array([], dtype=int)
+            self.missing_index = np.array([], dtype=int)
+            self.polygon_coords, self.polygon_offsets, self.new_poly_index = None, None, None
+        else:
+            self.geometry = 'polygons'
+            self.drop_index = entry['drop_index']
+            self.missing_index = entry['missing_index']
+            self.polygon_coords = entry['polygon_coords'].reshape(-1, 2)
+            self.polygon_offsets = entry['polygon_offsets']
+            self.polygon_lonlat = entry['polygon_lonlat'].reshape(-1, 2)
+            self.new_poly_index = entry['new_poly_index']
+            self.dtype = self.polygon_coords.dtype
+            self._cached_geometry = entry['geometry']
+
+        self._init_lazy_state()
+        self.construct_mesh()
+
+        return self
+
+    @staticmethod
+    def unshare(name, shared_dir=None):
+        """ Removes a mesh published with share (attached processes keep
+        their mapping until they exit)
+        """
+        cache = GeometryCache(_shared_dir(shared_dir), max_bytes=float('inf'))
+        if os.path.exists(cache.path(name)):
+            os.remove(cache.path(name))
+
+    @contextmanager
+    def _profile_stage(self, name):
+        """ Context manager that records the wall time, peak traced
+        memory and array bytes (set by the stage as 'nbytes') of a
+        construction stage when profiling is enabled. The peak is the
+        stage's own tracemalloc peak (Python objects and NumPy buffers,
+        not Arrow or GEOS allocations) above the memory traced when the
+        stage starts, so it does not depend on earlier stages or grids.
+        The stage is recorded even if it raises. Tracing is stopped again
+        if it was started here; if the caller was already tracing, the
+        peak it had reached since its last reset (which tracemalloc
+        cannot restore afterwards) is recorded as 'caller_peak', so the
+        caller's overall peak is the maximum over the records
+        Parameters
+        ----------
+        name : string
+            Name of the construction stage
+        """
+
+        stage = {'stage': name, 'nbytes': 0}
+        if not self.profile:
+            yield stage
+            return
+
+        # Trace allocations only while profiling a stage
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            traced_start, stage['caller_peak'] = tracemalloc.get_traced_memory()
+        else:
+            tracemalloc.start()
+            traced_start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        time_start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage['wall_time'] = time.perf_counter() - time_start
+            stage['peak_memory'] = tracemalloc.get_traced_memory()[1] - traced_start
+            if not tracing:
+                tracemalloc.stop()
+
+            self.profile_records.append(stage)
+            if self.profile_callback is not None:
+                self.profile_callback(stage)
+
+    def profile_report(self):
+        """ Returns the recorded construction stages as a DataFrame
+        Returns
+        -------
+        report : DataFrame
+            One row per stage with the wall time (seconds), peak traced
+            memory (bytes), array bytes produced by the stage and the
+            caller's tracemalloc peak before the stage (when the caller
+            was tracing)
+        """
+
+        return pd.DataFrame(self.profile_records, columns=['stage', 'wall_time', 'peak_memory', 'nbytes', 'caller_peak'])
+
+    def face_centroids(self, x, y, var_dict):
+        """ Computes the projected centroid of each face, using the
+        grid's face centers (Mesh2_face_x/y) when present
+        Parameters
         ----------
         x : ndarry
-            coordinate values for 'x' coordinates
+            coordinate values for 'x' coordinates (longitude)
         y : ndarray
-            coordinate values for 'y' coordinates
+            coordinate values for 'y' coordinates (latitude)
+        var_dict : dict
+            Dictonary of UGRID variable names
 
         Returns
         -------
-        polygon_array : ndarray
-            Array containing Polygon Coordinates (original and new)
+        face_coords : ndarray
+            Projected centroid coordinates [n_faces x 2]
         """
 
-        # Get Polygon Coordinate Data
-        poly_data = np.zeros((self.n_faces, 2*self.n_face_nodes))
-        poly_data[:, 0::2] = x[self.index]
-        poly_data[:, 1::2] = y[self.index]
+        face_x_name = var_dict.get('Mesh2_face_x')
+        face_y_name = var_dict.get('Mesh2_face_y')
 
-        # No Cyclic Polygons
-        if len(self.drop_index) == 0:
-            polygon_array = poly_data.reshape(self.n_faces, self.n_face_nodes, 2)
-            return polygon_array, None
+        # Face Centers given with the grid
+        if face_x_name in self.ds and face_y_name in self.ds:
+            lon = self.ds[face_x_name].values
+            lat = self.ds[face_y_name].values
 
-        # Get Cyclic Polygons
-        poly_to_fix = poly_data[self.drop_index]
+        # Normalized mean of the face nodes' unit vectors, which handles
+        # faces crossing the antimeridian
+        else:
+            node_lon = np.deg2rad(x[self.index].astype(np.float64))
+            node_lat = np.deg2rad(y[self.index].astype(np.float64))
+            face_start = self.face_offsets[:-1]
+            cx = np.add.reduceat(np.cos(node_lat) * np.cos(node_lon), face_start)
+            cy = np.add.reduceat(np.cos(node_lat) * np.sin(node_lon), face_start)
+            cz = np.add.reduceat(np.sin(node_lat), face_start)
+            lon = np.rad2deg(np.arctan2(cy, cx))
+            lat = np.rad2deg(np.arctan2(cz, np.hypot(cx, cy)))
+
+        # Lon/Lat Face Centroids (kept for reprojection)
+        self.face_lonlat = np.column_stack((lon, lat)).astype(self.dtype, copy=False)
+
+        face_coords = np.zeros((self.n_faces, 2), dtype=self.dtype)
+        self.transform_points(self.face_lonlat[:, 0], self.face_lonlat[:, 1], face_coords)
+
+        return face_coords
+
+    def rendered_polygons(self):
+        """ Returns the coordinates and offsets of the rendered
+        polygons (original and new, excluding cyclic cells), in
+        the order of polygon_face_index
+        """
+        if self.geometry == 'points':
+            raise ValueError("Polygons are not constructed when geometry='points'")
 
-        # Itterate over each Cyclic Polygon, splitting it into two
-        poly_list = []
-        new_poly_index = []
-        for i, poly in enumerate(poly_to_fix):
-            poly_left = poly.copy()
-            poly_right = poly.copy()
+        n_polygons = self.polygon_offsets.shape[0] - 1
+        keep_index = np.arange(0, n_polygons, 1)
+        if self.new_poly_index is not None:
+            keep_index = np.delete(keep_index, self.drop_index)
+        coord_index, keep_offsets = _ragged_take(self.polygon_offsets, keep_index)
+
+        return self.polygon_coords[coord_index], keep_offsets
+
+    def build_pyramid(self, min_cells=1024):
+        """ Builds a multi-resolution pyramid of coarsened meshes for
+        zoomed out rendering. Each level agglomerates neighbouring
+        polygons into the square cells of a regular grid (in projected
+        coordinates) whose cell size doubles every level, with cell
+        values taken as the area weighted mean of their polygons
+        (polygons with non finite projected coordinates are left out).
+        Each cell is drawn as the bounding box of its polygons, so a
+        coarse level covers everything the full mesh covers.
+        Level 0 is the full mesh. The pyramid is reused across variables
+        and stored in the geometry cache when enabled
+        Parameters
+        ----------
+        min_cells : int, optional
+            Coarsening stops before a level has fewer cells
 
-            # Start in RHS
-            if poly[0] > 0:
-                # Get Remaining x coordinates
-                x_remain_index = poly[2::2] > 0
+        Returns
+        -------
+        pyramid : list
+            Dictonary for each level with the cell size, area weighted
+            operator [n_cells x n_polygons] and GeoDataFrame of the
+            cell bounding boxes
+        """
 
-                # Update coordinates of Right Polygon
-                poly_right[2::2][~x_remain_index] = poly[2::2][~x_remain_index] + 360
+        coords, offsets = self.rendered_polygons()
+        n_polygons = offsets.shape[0] - 1
+
+        # Load Pyramid from the Cache
+        entry = None
+        if self.cache is not None:
+            pyramid_key = "{}-pyramid-boxes-{}".format(self.cache_key, min_cells)
+            entry = self.cache.load(pyramid_key)
+
+        if entry is None:
+            entry = {}
+
+            # Polygons with non finite (unprojectable) coordinates are never
+            # visible, and get zero weight in every cell
+            finite_coords = np.all(np.isfinite(coords), axis=1)
+            polygon_index = np.flatnonzero(np.logical_and.reduceat(finite_coords, offsets[:-1]))
+            coord_index, finite_offsets = _ragged_take(offsets, polygon_index)
+            finite_coords = coords[coord_index]
+
+            # Centroid and Projected Area of each Polygon
+            counts = np.diff(finite_offsets)
+            centroid_x = np.add.reduceat(finite_coords[:, 0], finite_offsets[:-1]) / counts
+            centroid_y = np.add.reduceat(finite_coords[:, 1], finite_offsets[:-1]) / counts
+            area = _polygon_areas(finite_coords, finite_offsets)
+            origin = finite_coords.min(axis=0)
+
+            # Bounding Box of each Polygon
+            starts = finite_offsets[:-1]
+            polygon_bounds = np.column_stack((np.minimum.reduceat(finite_coords[:, 0], starts),
+                                              np.minimum.reduceat(finite_coords[:, 1], starts),
+                                              np.maximum.reduceat(finite_coords[:, 0], starts),
+                                              np.maximum.reduceat(finite_coords[:, 1], starts)))
+
+            # Start with cells about twice the size of a typical polygon
+            cell_size = 2 * np.sqrt(np.median(area))
+
+            # Degenerate (zero area) polygons still contribute to their cell
+            area = np.maximum(area, 1e-9 * np.median(area))
+            level = 1
+            while cell_size > 0:
+                # Regular grid cell of each polygon's centroid
+                ix = np.floor((centroid_x - origin[0]) / cell_size).astype(np.int64)
+                iy = np.floor((centroid_y - origin[1]) / cell_size).astype(np.int64)
+                nx = ix.max() + 1
+                cells, cluster = np.unique(iy * nx + ix, return_inverse=True)
+                if cells.shape[0] < min_cells:
+                    break
+
+                # Area weighted mean of the polygons in each cell
+                operator = scipy.sparse.csr_matrix((area, (cluster, polygon_index)),
+                                                   shape=(cells.shape[0], n_polygons))
+                operator = scipy.sparse.diags(1.0 / operator.sum(axis=1).A1) @ operator
+                operator = operator.tocsr()
+
+                # Bounding Box of the polygons in each cell
+                order = np.argsort(cluster, kind='stable')
+                cell_starts = _counts_to_offsets(np.bincount(cluster))[:-1]
+                cell_bounds = np.column_stack((np.minimum.reduceat(polygon_bounds[order, 0], cell_starts),
+                                               np.minimum.reduceat(polygon_bounds[order, 1], cell_starts),
+                                               np.maximum.reduceat(polygon_bounds[order, 2], cell_starts),
+                                               np.maximum.reduceat(polygon_bounds[order, 3], cell_starts)))
+
+                entry['level{}_cell_size'.format(level)] = np.array([cell_size])
+                entry['level{}_bounds'.format(level)] = cell_bounds.ravel()
+                entry['level{}_indptr'.format(level)] = operator.indptr
+                entry['level{}_indices'.format(level)] = operator.indices
+                entry['level{}_weights'.format(level)] = operator.data
+
+                cell_size *= 2
+                level += 1
+
+            if self.cache is not None:
+                self.cache.store(pyramid_key, entry)
+
+        # Level 0 (Full Mesh)
+        self.pyramid = [{'cell_size': 0.0, 'operator': None, 'gdf': None}]
+
+        # Coarsened Levels (Cell Bounding Boxes)
+        level = 1
+        while 'level{}_cell_size'.format(level) in entry:
+            cell_size = entry['level{}_cell_size'.format(level)][0]
+            x0, y0, x1, y1 = entry['level{}_bounds'.format(level)].reshape(-1, 4).T
+            operator = scipy.sparse.csr_matrix((entry['level{}_weights'.format(level)],
+                                                entry['level{}_indices'.format(level)],
+                                                entry['level{}_indptr'.format(level)]),
+                                               shape=(x0.shape[0], n_polygons))
+
+            box_coords = np.stack((np.stack((x0, x1, x1, x0), axis=1),
+                                   np.stack((y0, y0, y1, y1), axis=1)), axis=2).reshape(-1, 2)
+            box_offsets = np.arange(0, 4 * x0.shape[0] + 1, 4)
+            polygons = sp.geometry.MultiPolygonArray(_polygons_to_arrow(box_coords.astype(self.dtype),
+                                                                        box_offsets))
+
+            self.pyramid.append({'cell_size': cell_size, 'operator': operator,
+                                 'gdf': sp.GeoDataFrame({'geometry': polygons})})
+            level += 1
+
+        return self.pyramid
+
+    def select_level(self, x_range, y_range, width, height):
+        """ Selects the coarsest pyramid level whose cells are no
+        larger than a pixel of the canvas
+        Parameters
+        ----------
+        x_range : tuple, required
+            Viewport extent (x_min, x_max) in projected coordinates
+        y_range : tuple, required
+            Viewport extent (y_min, y_max) in projected coordinates
+        width : int, required
+            Canvas width in pixels
+        height : int, required
+            Canvas height in pixels
 
-                # Update coordinates of Left Polygon
-                poly_left[0] = poly[0] - 360
-                poly_left[2::2][x_remain_index] = poly[2::2][x_remain_index] - 360
+        Returns
+        -------
+        level : int
+            Index into pyramid
+        """
+        if self.pyramid is None:
+            self.build_pyramid()
 
-            # Start in LHS
-            elif poly[0] < 0:
-                # Get Remaining x coordinates
-                x_remain_index = poly[2::2] < 0
+        pixel_size = max((x_range[1] - x_range[0]) / width, (y_range[1] - y_range[0]) / height)
 
-                # Update coordinates of Left Polygon
-                poly_left[2::2][~x_remain_index] = poly[2::2][~x_remain_index] - 360
+        level = 0
+        for i, pyramid_level in enumerate(self.pyramid):
+            if pyramid_level['cell_size'] <= pixel_size:
+                level = i
+        return level
 
-                # Update coordinates of Right Polygon
-                poly_right[0] = poly[0] + 360
-                poly_right[2::2][x_remain_index] = poly[2::2][x_remain_index] + 360
+    def pyramid_mesh(self, name, dims, x_range, y_range, width, height, fill='nodes', reducer='mean'):
+        """ Given a Variable Name, Dimensions and a Viewport, returns a
+        GeoDataFrame at the pyramid level suited to the canvas resolution
+        Parameters
+        ----------
+        name : string, required
+            Name of data variable for rendering
+        dims : dict, required
+            Dictonary of dimensions for data variable
+        x_range, y_range : tuple, required
+            Viewport extent in projected coordinates
+        width, height : int, required
+            Canvas size in pixels
+        fill : string
+            Location of the data, 'nodes', 'edges' or 'faces'
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values, see
+            REDUCERS, or a function of the gathered values and offsets
 
-            # Ignore
-            else:
-                # longitude = 0, might be the pole issue
-                print("Missing Polygon at Index: {}".format(i))
-                continue
+        Returns
+        -------
+        gdf : GeoDataFrame
+            Contains polygon geometry and face values
+        """
+        level = self.select_level(x_range, y_range, width, height)
+        if level == 0:
+            return self.data_mesh(name, dims, fill, reducer=reducer)
+
+        # Area Weighted Mean of each Cell, ignoring NaN face values
+        face_array = self.face_values(name, dims, fill, reducer=reducer)
+        valid = ~np.isnan(face_array)
+        operator = self.pyramid[level]['operator']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cell_array = (operator @ np.where(valid, face_array, 0)) / (operator @ valid)
+
+        return self.pyramid[level]['gdf'].assign(faces = cell_array)
+
+    def build_partitions(self, npartitions=None, p=15):
+        """ Sorts (once) the rendered polygons along a Hilbert curve
+        through their bounding box centers and splits them into spatially
+        compact partitions. Polygons with non finite projected
+        coordinates are never visible and are left out
+        Parameters
+        ----------
+        npartitions : int, optional
+            Number of partitions, defaults to the CPU count
+        p : int, optional
+            Hilbert curve order
+
+        Returns
+        -------
+        partitions : dict
+            Hilbert order of the visible rendered polygons ('order'), sorted
+            geometry ('geometry'), partition offsets into the sorted
+            polygons ('bounds') and partition extents ('partition_bounds')
+        """
+
+        if self.geometry == 'points':
+            raise ValueError("Partitions require geometry='polygons'")
+
+        geometry = self.gdf['geometry'].values
+        coords, offsets = self.rendered_polygons()
+        polygon_bounds = np.column_stack((np.fmin.reduceat(coords[:, 0], offsets[:-1]),
+                                          np.fmin.reduceat(coords[:, 1], offsets[:-1]),
+                                          np.fmax.reduceat(coords[:, 0], offsets[:-1]),
+                                          np.fmax.reduceat(coords[:, 1], offsets[:-1])))
+
+        # Polygons with non finite (unprojectable) coordinates are never
+        # visible, and are left out of the partitions
+        polygon_index = np.flatnonzero(np.all(np.isfinite(polygon_bounds), axis=1))
+        polygon_bounds = polygon_bounds[polygon_index]
+
+        # Bounding Box Centers on a [2**p x 2**p] grid over the mesh extent
+        x = (polygon_bounds[:, 0] + polygon_bounds[:, 2]) / 2
+        y = (polygon_bounds[:, 1] + polygon_bounds[:, 3]) / 2
+        n = 2**p
+        x = (x - x.min()) / max(x.max() - x.min(), 1e-12) * n
+        y = (y - y.min()) / max(y.max() - y.min(), 1e-12) * n
+        x = np.clip(x, 0, n - 1).astype(np.int64)
+        y = np.clip(y, 0, n - 1).astype(np.int64)
+
+        hilbert_order = np.argsort(_hilbert_distances(x, y, p), kind='stable')
+        order = polygon_index[hilbert_order]
+        polygon_bounds = polygon_bounds[hilbert_order]
+
+        if npartitions is None:
+            npartitions = os.cpu_count() or 1
+        npartitions = max(1, min(npartitions, order.shape[0]))
+        bounds = np.linspace(0, order.shape[0], npartitions + 1).astype(np.int64)
+        starts = bounds[:-1]
+        partition_bounds = pd.DataFrame({'x0': np.minimum.reduceat(polygon_bounds[:, 0], starts),
+                                         'y0': np.minimum.reduceat(polygon_bounds[:, 1], starts),
+                                         'x1': np.maximum.reduceat(polygon_bounds[:, 2], starts),
+                                         'y1': np.maximum.reduceat(polygon_bounds[:, 3], starts)})
+        partition_bounds.index.name = 'partition'
+
+        self.partitions = {'order': order,
+                           'geometry': geometry.take(order),
+                           'bounds': bounds,
+                           'partition_bounds': partition_bounds}
+
+        return self.partitions
+
+    def partitioned_mesh(self, name, dims, fill='nodes', reducer='mean', npartitions=None):
+        """ Given a Variable Name and Dimensions, returns a Hilbert sorted
+        DaskGeoDataFrame of spatially compact partitions, so Datashader
+        aggregates partitions in parallel and skips partitions outside
+        the viewport
+        Parameters
+        ----------
+        name : string, required
+            Name of data variable for rendering
+        dims : dict, required
+            Dictonary of dimensions for data variable
+        fill : string
+            Location of the data, 'nodes', 'edges' or 'faces'
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values
+        npartitions : int, optional
+            Number of partitions when the partitions are first built
+
+        Returns
+        -------
+        ddf : DaskGeoDataFrame
+            Contains polygon geometry and face values, in Hilbert order
+        """
+
+        if self.partitions is None:
+            self.build_partitions(npartitions)
+
+        face_array = self.face_values(name, dims, fill, reducer=reducer)
+        if face_array.ndim != 1:
+            raise ValueError("dims must select a single index of every non spatial dimension")
+
+        return self._partitioned_frame('faces', face_array[self.partitions['order']])
+
+    def save_partitions(self, path):
+        """ Writes the Hilbert sorted geometry, with the rendered polygon
+        index of each row and the partition bounds, to a Parquet dataset
+        """
+
+        if self.partitions is None:
+            self.build_partitions()
+
+        self._partitioned_frame('polygon', self.partitions['order']).to_parquet(path)
+
+    def load_partitions(self, path):
+        """ Loads partitions written by save_partitions, so the Hilbert
+        sort is not repeated
+        """
+        from spatialpandas.io import read_parquet_dask
+
+        ddf = read_parquet_dask(path)
+        partition_bounds = ddf.geometry.partition_bounds
+        counts = ddf.map_partitions(len).compute().values
+        gdf = ddf.compute()
+
+        order = gdf['polygon'].values
+        if order.shape[0] > 0 and order.max() >= self.polygon_face_index.shape[0]:
+            raise ValueError("Partitions at '{}' do not match the rendered polygons".format(path))
+
+        self.partitions = {'order': order,
+                           'geometry': gdf['geometry'].values,
+                           'bounds': _counts_to_offsets(counts),
+                           'partition_bounds': partition_bounds}
+
+        return self.partitions
+
+    def _partitioned_frame(self, column, values):
+        """ Builds a DaskGeoDataFrame of the sorted geometry and a column
+        of sorted values, one partition per Hilbert partition, seeded
+        with the partition bounds computed by build_partitions
+        """
+        import dask.dataframe as dd
+        from dask import delayed
+
+        geometry = self.partitions['geometry']
+        bounds = self.partitions['bounds']
+
+        partitions = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            partitions.append(delayed(_geometry_partition)(geometry[start:stop], values[start:stop], start, column))
+
+        meta = sp.GeoDataFrame({'geometry': geometry[:0], column: values[:0]})
+        divisions = tuple(bounds[:-1]) + (bounds[-1] - 1,)
+        ddf = dd.from_delayed(partitions, meta=meta, divisions=divisions)
+
+        # Partition Bounds, so Datashader skips partitions without computing
+        # them (set the same way spatialpandas' read_parquet_dask does)
+        ddf._partition_bounds = {'geometry': self.partitions['partition_bounds']}
+
+        return ddf
+
+    def build_spatial_index(self, polygons_per_bucket=16):
+        """ Builds a packed grid bucket index over the bounding boxes
+        of the rendered polygons, used for viewport culling. Each
+        polygon is listed in every bucket its bounding box overlaps
+        Parameters
+        ----------
+        polygons_per_bucket : int, optional
+            Average number of polygons per bucket
+
+        Returns
+        -------
+        spatial_index : dict
+            Polygon bounds [n_polygons x 4] (x_min, y_min, x_max, y_max),
+            grid extent and bucket size, and ragged bucket contents
+        """
 
-            # Ensure longitude values are within +- 180 bound
-            poly_left[::2][poly_left[::2] < -180] = -180.0
-            poly_right[::2][poly_right[::2] > 180] = 180.0
+        coords, offsets = self.rendered_polygons()
+        starts = offsets[:-1]
+        bounds = np.column_stack((np.minimum.reduceat(coords[:, 0], starts),
+                                  np.minimum.reduceat(coords[:, 1], starts),
+                                  np.maximum.reduceat(coords[:, 0], starts),
+                                  np.maximum.reduceat(coords[:, 1], starts)))
+
+        # Polygons with non finite (unprojectable) coordinates are never visible
+        polygon_index = np.flatnonzero(np.all(np.isfinite(bounds), axis=1))
+        polygon_bounds = bounds[polygon_index]
+
+        # Square grid of buckets over the extent of the mesh
+        extent = np.concatenate((polygon_bounds[:, :2].min(axis=0), polygon_bounds[:, 2:].max(axis=0)))
+        n_buckets = max(1, int(np.sqrt(polygon_index.shape[0] / polygons_per_bucket)))
+        bucket_size = np.maximum((extent[2:] - extent[:2]) / n_buckets, np.finfo(np.float64).tiny)
+
+        # Range of buckets overlapped by each polygon
+        bucket_min = np.clip(((polygon_bounds[:, :2] - extent[:2]) // bucket_size).astype(np.int64), 0, n_buckets - 1)
+        bucket_max = np.clip(((polygon_bounds[:, 2:] - extent[:2]) // bucket_size).astype(np.int64), 0, n_buckets - 1)
+        bucket_span = bucket_max - bucket_min + 1
+        n_pairs = bucket_span[:, 0] * bucket_span[:, 1]
+
+        # Expand into (polygon, bucket) pairs
+        pair_offsets = _counts_to_offsets(n_pairs)
+        local = np.arange(pair_offsets[-1]) - np.repeat(pair_offsets[:-1], n_pairs)
+        span_x = np.repeat(bucket_span[:, 0], n_pairs)
+        bucket_x = np.repeat(bucket_min[:, 0], n_pairs) + local % span_x
+        bucket_y = np.repeat(bucket_min[:, 1], n_pairs) + local // span_x
+        bucket = bucket_y * n_buckets + bucket_x
+
+        # Pack polygons by bucket (stable, so each bucket stays in polygon order)
+        order = np.argsort(bucket, kind='stable')
+        self.spatial_index = {'bounds': bounds,
+                              'extent': extent,
+                              'n_buckets': n_buckets,
+                              'bucket_size': bucket_size,
+                              'bucket_offsets': _counts_to_offsets(np.bincount(bucket, minlength=n_buckets**2)),
+                              'bucket_polygons': np.repeat(polygon_index, n_pairs)[order]}
+
+        return self.spatial_index
+
+    def viewport_index(self, x_range, y_range):
+        """ Returns the index of the rendered polygons whose bounding
+        box intersects the viewport, in rendering order
+        Parameters
+        ----------
+        x_range : tuple, required
+            Viewport extent (x_min, x_max) in projected coordinates
+        y_range : tuple, required
+            Viewport extent (y_min, y_max) in projected coordinates
 
-            # Store New Polygons and Corresponding Indicies
-            poly_list.extend([poly_left, poly_right])
-            new_poly_index.extend([self.drop_index[i], self.drop_index[i]])
+        Returns
+        -------
+        polygon_index : ndarray
+            Index of the visible polygons
+        """
+        if self.spatial_index is None:
+            self.build_spatial_index()
+
+        index = self.spatial_index
+        extent = index['extent']
+        n_buckets = index['n_buckets']
+
+        # Viewport outside of the mesh
+        if (x_range[1] < extent[0] or x_range[0] > extent[2] or
+                y_range[1] < extent[1] or y_range[0] > extent[3]):
+            return np.array([], dtype=np.int64)
+
+        # Buckets overlapped by the viewport
+        viewport_min = np.array([x_range[0], y_range[0]])
+        viewport_max = np.array([x_range[1], y_range[1]])
+        bucket_min = np.clip(((viewport_min - extent[:2]) // index['bucket_size']).astype(np.int64), 0, n_buckets - 1)
+        bucket_max = np.clip(((viewport_max - extent[:2]) // index['bucket_size']).astype(np.int64), 0, n_buckets - 1)
+        buckets = (np.arange(bucket_min[1], bucket_max[1] + 1)[:, np.newaxis] * n_buckets +
+                   np.arange(bucket_min[0], bucket_max[0] + 1)[np.newaxis, :]).ravel()
+
+        # Candidate polygons (sorted and deduplicated), then an exact bounding box test
+        element_index, _ = _ragged_take(index['bucket_offsets'], buckets)
+        candidates = np.unique(index['bucket_polygons'][element_index])
+        bounds = index['bounds'][candidates]
+        visible = ((bounds[:, 2] >= x_range[0]) & (bounds[:, 0] <= x_range[1]) &
+                   (bounds[:, 3] >= y_range[0]) & (bounds[:, 1] <= y_range[1]))
+
+        return candidates[visible]
+
+    def viewport(self, x_range, y_range):
+        """ Returns the rendered polygons (and face values, if set by
+        data_mesh) that intersect the viewport
+        Parameters
+        ----------
+        x_range : tuple, required
+            Viewport extent (x_min, x_max) in projected coordinates
+        y_range : tuple, required
+            Viewport extent (y_min, y_max) in projected coordinates
 
+        Returns
+        -------
+        gdf : GeoDataFrame
+            Visible polygons, indexed by their position in the full mesh
+        """
+        return self.gdf.iloc[self.viewport_index(x_range, y_range)]
 
-        n_new_faces = len(poly_list)
-        new_poly_data = np.array(poly_list)
-        new_poly_index = np.array(new_poly_index)
+    def rasterize(self, name, dims, width, height, x_range=None, y_range=None, fill='nodes', agg='mean', n_threads=1,
+                  reducer='mean'):
+        """ Given a Variable Name and Dimensions, rasterizes the
+        rendered polygons into an image without going through
+        spatialpandas or Datashader (see rasterize_polygons)
+        Parameters
+        ----------
+        name : string, required
+            Name of data variable for rendering
+        dims : dict, required
+            Dictonary of dimensions for data variable
+        width, height : int, required
+            Canvas size in pixels
+        x_range, y_range : tuple, optional
+            Canvas extent in projected coordinates, defaults to the
+            extent of the mesh
+        fill : string
+            Location of the data, 'nodes', 'edges' or 'faces'
+        agg : string
+            Pixel aggregation, 'mean', 'min', 'max' or 'first'
+        n_threads : int, optional
+            Number of threads, each rasterizing a band of rows
+        reducer : string or callable, optional
+            Reduction of node or edge values to face values, see
+            REDUCERS, or a function of the gathered values and offsets
 
-        # Number of Total Polygons (Original and New)
-        n_total_polygons = self.n_faces + n_new_faces
+        Returns
+        -------
+        image : ndarray
+            Aggregated values [height x width], NaN where no polygon
+            covers a pixel, with row 0 at the bottom (y_min)
+        """
 
-        # Create a Polygon Array with new Left and Right Polygons
-        polygon_array = np.zeros((n_total_polygons, self.n_face_nodes, 2))
+        face_array = self.face_values(name, dims, fill, reducer=reducer)
+        coords, offsets = self.rendered_polygons()
 
-        # Set Polygon Coordinates (With Transform)
-        x_orig, y_orig, _ = self.projection.transform_points(ccrs.PlateCarree(),
-                                                            poly_data[:, 0::2],
-                                                            poly_data[:, 1::2]).T
-        polygon_array[:self.n_faces, :, 0] = x_orig.T.astype(np.float32)
-        polygon_array[:self.n_faces, :, 1] = y_orig.T.astype(np.float32)
+        if x_range is None or y_range is None:
+            finite = np.all(np.isfinite(coords), axis=1)
+            coord_min = coords[finite].min(axis=0)
+            coord_max = coords[finite].max(axis=0)
+            x_range = (coord_min[0], coord_max[0]) if x_range is None else x_range
+            y_range = (coord_min[1], coord_max[1]) if y_range is None else y_range
 
-        # Set Coordinates for new (left & right) polygons
-        x_new, y_new, _ = self.projection.transform_points(ccrs.PlateCarree(),
-                                                            new_poly_data[:, 0::2],
-                                                            new_poly_data[:, 1::2]).T
-        polygon_array[self.n_faces:, :, 0] = x_new.T
-        polygon_array[self.n_faces:, :, 1] = y_new.T
+        # Only rasterize the polygons within the viewport
+        else:
+            polygon_index = self.viewport_index(x_range, y_range)
+            coord_index, offsets = _ragged_take(offsets, polygon_index)
+            coords = coords[coord_index]
+            face_array = face_array[polygon_index]
 
-        # Set Polygon Coordinates (No Transform)
-        # polygon_array[:self.n_faces, :, 0] = poly_data[:, 0::2]
-        # polygon_array[:self.n_faces, :, 1] = poly_data[:, 1::2]
-        # polygon_array[self.n_faces:, :, 0] = new_poly_data[:, 0::2]
-        # polygon_array[self.n_faces:, :, 1] = new_poly_data[:, 1::2]
+        return rasterize_polygons(coords, offsets, face_array, width, height,
+                                  x_range, y_range, agg=agg, n_threads=n_threads)
 
-        return polygon_array, new_poly_index
+    def find_cyclic_polygons(self, poly_x):
+        """ Finds cyclic polygons (longitude edges) and returns
+        their indicies
+        Parameters
+        ----------
+        poly_x : ndarry
+            'x' coordinate of each face node (ragged)
+
+        Returns
+        -------
+        drop_index : ndarray
+            Array containing indices to cyclic polygons
+        """
+
+        face_start = self.face_offsets[:-1]
+
+        # Find any polygon that has (+) & (-) x values
+        out_left = np.maximum.reduceat(poly_x, face_start) <= 0
+        out_right = np.minimum.reduceat(poly_x, face_start) >= 0
+        out = out_left | out_right
+
+        # Find all polygons between some (+) and (-) buffer
+        center_buffer = 80
+        corrected_index = np.minimum.reduceat(np.abs(poly_x), face_start) < center_buffer
 
+        # Store Index of Cyclic Cells, excluding those center polygons
+        drop_index = np.arange(0, self.n_faces, 1)
+        drop_index = drop_index[~out & ~corrected_index]
 
+        return drop_index
+
+
+
+    def create_polygon_array(self, poly_x, poly_y):
+        """ Converts coordinate and face node data to
+        ragged polygon coordinates, taking into account cyclic
+        polygons
+        Parameters
+        ----------
+        poly_x : ndarry
+            'x' coordinate of each face node (ragged)
+        poly_y : ndarray
+            'y' coordinate of each face node (ragged)
+
+        Returns
+        -------
+        polygon_coords : ndarray
+            Array containing Polygon Coordinates (original and new)
+            [n_polygon_nodes x 2]
+        polygon_offsets : ndarray
+            Offsets of each Polygon into polygon_coords
+        new_poly_index : ndarray
+            Face index of each new (left & right) polygon
+        """
+
+        # No Cyclic Polygons
+        if len(self.drop_index) == 0:
+            self.polygon_lonlat = np.column_stack((poly_x, poly_y))
+            return self.project_polygons(), self.face_offsets, None
+
+        with self._profile_stage('split') as stage:
+            # Get Cyclic Polygons
+            fix_coord_index, fix_offsets = _ragged_take(self.face_offsets, self.drop_index)
+
+            # Split each Cyclic Polygon into a Left and Right Polygon
+            new_x, new_y, new_offsets, new_poly_index, self.missing_index = self.split_polygons(poly_x[fix_coord_index],
+                                                                                                poly_y[fix_coord_index],
+                                                                                                fix_offsets,
+                                                                                                self.drop_index)
+            stage['nbytes'] = new_x.nbytes + new_y.nbytes + new_offsets.nbytes + new_poly_index.nbytes
+
+        n_nodes = poly_x.shape[0]
+        n_new_nodes = new_x.shape[0]
+
+        # Number of Total Polygon Nodes (Original and New)
+        n_total_nodes = n_nodes + n_new_nodes
+
+        # Lon/Lat Polygon Array with new Left and Right Polygons (kept for reprojection)
+        self.polygon_lonlat = np.zeros((n_total_nodes, 2), dtype=self.dtype)
+        self.polygon_lonlat[:n_nodes, 0] = poly_x
+        self.polygon_lonlat[:n_nodes, 1] = poly_y
+        self.polygon_lonlat[n_nodes:, 0] = new_x
+        self.polygon_lonlat[n_nodes:, 1] = new_y
+        polygon_offsets = np.concatenate((self.face_offsets, new_offsets[1:] + n_nodes))
+
+        return self.project_polygons(), polygon_offsets, new_poly_index
+
+    def project_polygons(self):
+        """ Transforms the lon/lat polygon array into the projection
+        Returns
+        -------
+        polygon_coords : ndarray
+            Projected Polygon Coordinates [n_polygon_nodes x 2]
+        """
+
+        with self._profile_stage('projection') as stage:
+            polygon_coords = np.zeros(self.polygon_lonlat.shape, dtype=self.dtype)
+            self.transform_points(self.polygon_lonlat[:, 0], self.polygon_lonlat[:, 1], polygon_coords)
+            stage['nbytes'] = polygon_coords.nbytes
+
+        return polygon_coords
+
+    def transform_points(self, x, y, out):
+        """ Transforms longitude and latitude coordinates into the
+        projection, in chunks on a thread or process pool, writing
+        the results into a preallocated output
+        Parameters
+        ----------
+        x : ndarray
+            Longitude of each point
+        y : ndarray
+            Latitude of each point
+        out : ndarray
+            Output projection coordinates [n_points x 2]
+        """
+
+        n_points = x.shape[0]
+        if n_points == 0:
+            return out
+
+        # PlateCarree only wraps longitudes into [-180, 180]
+        if self.projection == ccrs.PlateCarree():
+            out[:, 0] = np.where((x < -180) | (x > 180), (x + 180) % 360 - 180, x)
+            out[:, 1] = y
+            return out
+
+        bounds = list(range(0, n_points, self.transform_chunk_size)) + [n_points]
+        chunks = list(zip(bounds[:-1], bounds[1:]))
+
+        # Single Chunk or Worker, transform in this thread
+        if len(chunks) == 1 or self.transform_workers == 1:
+            for start, stop in chunks:
+                _transform_chunk(self.projection, x[start:stop], y[start:stop], out[start:stop])
+
+        # Threads write directly into their slice of the output
+        elif self.transform_pool == 'thread':
+            with ThreadPoolExecutor(max_workers=self.transform_workers) as executor:
+                futures = [executor.submit(_transform_chunk, self.projection,
+                                           x[start:stop], y[start:stop], out[start:stop])
+                           for start, stop in chunks]
+                for future in futures:
+                    future.result()
+
+        # Processes return their chunk, which is copied into the output
+        elif self.transform_pool == 'process':
+            with ProcessPoolExecutor(max_workers=self.transform_workers) as executor:
+                futures = [executor.submit(_transform_chunk, self.projection, x[start:stop], y[start:stop])
+                           for start, stop in chunks]
+                for (start, stop), future in zip(chunks, futures):
+                    out[start:stop] = future.result()
+
+        else:
+            raise ValueError("Invalid transform_pool '{}', expected 'thread' or 'process'".format(self.transform_pool))
+
+        return out
+
+    def split_polygons(self, poly_x, poly_y, offsets, fix_index):
+        """ Splits cyclic polygons into a left and right polygon
+        along the antimeridian, operating on all polygons at once
+        Parameters
+        ----------
+        poly_x : ndarray
+            Ragged x coordinates of cyclic polygons
+        poly_y : ndarray
+            Ragged y coordinates of cyclic polygons
+        offsets : ndarray
+            Offsets of each cyclic polygon into poly_x and poly_y
+        fix_index : ndarray
+            Face index of each cyclic polygon
+
+        Returns
+        -------
+        new_x : ndarray
+            Ragged x coordinates of new polygons, each left polygon
+            followed by its right polygon
+        new_y : ndarray
+            Ragged y coordinates of new polygons
+        new_offsets : ndarray
+            Offsets of each new polygon into new_x and new_y
+        new_poly_index : ndarray
+            Face index of each new polygon
+        missing_index : ndarray
+            Face indices of cyclic polygons that could not be split
+        """
+
+        # Polygons starting at longitude = 0 are skipped, might be the pole issue
+        x_start = poly_x[offsets[:-1]]
+        split = x_start != 0
+        missing_index = fix_index[~split]
+
+        coord_index, split_offsets = _ragged_take(offsets, np.flatnonzero(split))
+        xs = poly_x[coord_index]
+        ys = poly_y[coord_index]
+        counts = np.diff(split_offsets)
+        x_start = np.repeat(x_start[split], counts)
+
+        # Nodes on the RHS of the antimeridian (x = 0 is grouped
+        # opposite to the side the polygon starts on)
+        x_right = np.where(x_start > 0, xs > 0, xs >= 0)
+
+        # Position of each node in the Left and Right Polygons, with
+        # each left polygon followed by its right polygon
+        left_index = np.arange(xs.shape[0]) + np.repeat(split_offsets[:-1], counts)
+        right_index = left_index + np.repeat(counts, counts)
+
+        # Shift RHS nodes of Left Polygon and LHS nodes of Right Polygon,
+        # ensuring longitude values are within +- 180 bound
+        new_x = np.zeros(2 * xs.shape[0], dtype=xs.dtype)
+        new_x[left_index] = np.maximum(xs - 360 * x_right, -180.0)
+        new_x[right_index] = np.minimum(xs + 360 * ~x_right, 180.0)
+        new_y = np.zeros(2 * ys.shape[0], dtype=ys.dtype)
+        new_y[left_index] = ys
+        new_y[right_index] = ys
+
+        # Offsets and Corresponding Indicies
+        new_offsets = _counts_to_offsets(np.repeat(counts, 2))
+        new_poly_index = np.repeat(fix_index[split], 2)
+
+        return new_x, new_y, new_offsets, new_poly_index, missing_index
+
+
+class GeometryCache():
+    def __init__(self, cache_dir, max_bytes=2**30):
+        """ On-disk cache of Polymesh geometry, storing each entry as
+        a single row Arrow IPC file that is reloaded with memory mapping
+        Parameters
+        ----------
+        cache_dir : string, required
+            Directory for cache entries, created if it does not exist
+        max_bytes : int, optional
+            Maximum total size of cache entries, least recently used
+            entries are evicted first
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, *arrays, projection=None):
+        """ Hashes grid arrays (node coordinates, connectivity) and the
+        projection's proj4 string into a cache key
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for arr in arrays:
+            arr = np.ascontiguousarray(arr)
+            h.update("{}{}".format(arr.dtype.str, arr.shape).encode())
+            h.update(arr.tobytes())
+        if projection is not None:
+            h.update(projection.proj4_init.encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        """ Returns the file path of a cache entry"""
+        return os.path.join(self.cache_dir, key + ".arrow")
+
+    def load(self, key):
+        """ Loads a cache entry as a dictonary of memory mapped
+        arrays, returns None if the entry does not exist
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+        # Mark entry as recently used
+        os.utime(path)
+
+        entry = {}
+        for name in table.column_names:
+            column = table.column(name).chunk(0)
+            if column.null_count:
+                entry[name] = None
+            elif pa.types.is_primitive(column.type.value_type):
+                entry[name] = column.values.to_numpy(zero_copy_only=True)
+            else:
+                entry[name] = column.values
+        return entry
+
+    def store(self, key, entry):
+        """ Writes a dictonary of arrays (ndarray, pa.Array or None)
+        as a cache entry and evicts old entries
+        """
+        columns = {}
+        for name, arr in entry.items():
+            if arr is None:
+                columns[name] = pa.array([None], type=pa.large_list(pa.int64()))
+                continue
+            if not isinstance(arr, pa.Array):
+                arr = pa.array(arr)
+            columns[name] = pa.LargeListArray.from_arrays(pa.array([0, len(arr)], type=pa.int64()), arr)
+        table = pa.table(columns)
+
+        # Write to a temporary file so readers never see partial entries
+        path = self.path(key)
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """ Removes least recently used entries until the cache
+        is within max_bytes
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".arrow"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total_bytes -= size
+
+
+def rasterize_polygons(coords, offsets, values, width, height, x_range, y_range, agg='mean', n_threads=1):
+    """ Scan-converts ragged polygons into an image, using an edge
+    table evaluated at pixel centers (even-odd rule). A pixel is
+    covered by a polygon when its center lies inside the polygon
+    Parameters
+    ----------
+    coords : ndarray
+        Polygon node coordinates [n_polygon_nodes x 2]
+    offsets : ndarray
+        Offsets of each polygon into coords
+    values : ndarray
+        Value of each polygon, polygons with NaN values are ignored
+    width, height : int, required
+        Canvas size in pixels
+    x_range, y_range : tuple, required
+        Canvas extent (min, max)
+    agg : string
+        Pixel aggregation, 'mean', 'min', 'max' or 'first' (lowest
+        polygon index)
+    n_threads : int, optional
+        Number of threads, each rasterizing a band of rows
+
+    Returns
+    -------
+    image : ndarray
+        Aggregated values [height x width], NaN where no polygon
+        covers a pixel, with row 0 at the bottom (y_min)
+    """
+
+    if agg not in ('mean', 'min', 'max', 'first'):
+        raise ValueError("Invalid agg '{}', expected 'mean', 'min', 'max' or 'first'".format(agg))
+
+    # Ignore polygons with NaN values or non finite coordinates
+    counts = np.diff(offsets)
+    finite_coords = np.all(np.isfinite(coords), axis=1)
+    finite = np.logical_and.reduceat(finite_coords, offsets[:-1]) & (counts > 0) if coords.shape[0] else counts > 0
+    keep = np.flatnonzero(finite & ~np.isnan(values))
+    coord_index, offsets = _ragged_take(offsets, keep)
+    coords = coords[coord_index].astype(np.float64)
+    values = values[keep]
+    counts = np.diff(offsets)
+
+    # Edge Table (each node to the next node, wrapping to the first)
+    next_index = np.arange(1, coords.shape[0] + 1)
+    next_index[offsets[1:] - 1] = offsets[:-1]
+    edges = {'polygon': np.repeat(np.arange(keep.shape[0]), counts),
+             'x0': coords[:, 0], 'y0': coords[:, 1],
+             'x1': coords[next_index, 0], 'y1': coords[next_index, 1]}
+
+    dx = (x_range[1] - x_range[0]) / width
+    dy = (y_range[1] - y_range[0]) / height
+    canvas = (width, height, x_range[0], y_range[0], dx, dy)
+
+    # Split the canvas into bands of rows, rasterized independently
+    bounds = np.linspace(0, height, max(1, min(n_threads, height)) + 1).astype(np.int64)
+    bands = list(zip(bounds[:-1], bounds[1:]))
+    image = np.full((height, width), np.nan)
+
+    if len(bands) == 1:
+        image[:] = _rasterize_band(edges, values, canvas, agg, 0, height)
+    else:
+        with ThreadPoolExecutor(max_workers=len(bands)) as executor:
+            futures = [executor.submit(_rasterize_band, edges, values, canvas, agg, row_lo, row_hi)
+                       for row_lo, row_hi in bands]
+            for (row_lo, row_hi), future in zip(bands, futures):
+                image[row_lo:row_hi] = future.result()
+
+    return image
+
+
+def _rasterize_band(edges, values, canvas, agg, row_lo, row_hi):
+    """ Rasterizes the rows [row_lo, row_hi) of the canvas"""
+    width, height, x_min, y_min, dx, dy = canvas
+    n_rows = row_hi - row_lo
+
+    # Rows whose pixel center lies in [y_lo, y_hi) of each edge (horizontal edges have none)
+    y_lo = np.minimum(edges['y0'], edges['y1'])
+    y_hi = np.maximum(edges['y0'], edges['y1'])
+    row_start = np.clip(np.ceil((y_lo - y_min) / dy - 0.5), row_lo, row_hi).astype(np.int64)
+    row_end = np.clip(np.ceil((y_hi - y_min) / dy - 0.5), row_lo, row_hi).astype(np.int64)
+    n_crossings = np.maximum(row_end - row_start, 0)
+
+    # Expand into (edge, row) crossings at the pixel center
+    crossing_edge = np.repeat(np.arange(n_crossings.shape[0]), n_crossings)
+    crossing_offsets = _counts_to_offsets(n_crossings)
+    row = (np.repeat(row_start, n_crossings) +
+           np.arange(crossing_offsets[-1]) - np.repeat(crossing_offsets[:-1], n_crossings))
+    y_center = y_min + (row + 0.5) * dy
+    x0, y0 = edges['x0'][crossing_edge], edges['y0'][crossing_edge]
+    x1, y1 = edges['x1'][crossing_edge], edges['y1'][crossing_edge]
+    x_cross = x0 + (y_center - y0) * (x1 - x0) / (y1 - y0)
+
+    # Sort crossings by polygon and row, then pair them into spans
+    span_key = edges['polygon'][crossing_edge] * height + row
+    order = np.argsort(span_key, kind='stable')
+    span_key = span_key[order]
+    x_cross = x_cross[order]
+
+    # Convex polygons cross each row exactly twice, otherwise also sort by x
+    if np.array_equal(span_key[0::2], span_key[1::2]) and np.all(span_key[1:-1:2] != span_key[2::2]):
+        x_start = np.minimum(x_cross[0::2], x_cross[1::2])
+        x_end = np.maximum(x_cross[0::2], x_cross[1::2])
+    else:
+        order = np.lexsort((x_cross, span_key))
+        x_cross = x_cross[order]
+        x_start, x_end = x_cross[0::2], x_cross[1::2]
+    span_key = span_key[0::2]
+
+    # Columns whose pixel center lies in [x_start, x_end) of each span
+    col_start = np.clip(np.ceil((x_start - x_min) / dx - 0.5), 0, width).astype(np.int64)
+    col_end = np.clip(np.ceil((x_end - x_min) / dx - 0.5), 0, width).astype(np.int64)
+    n_pixels = np.maximum(col_end - col_start, 0)
+
+    # Expand spans into covered pixels
+    pixel_offsets = _counts_to_offsets(n_pixels)
+    col = (np.repeat(col_start, n_pixels) +
+           np.arange(pixel_offsets[-1]) - np.repeat(pixel_offsets[:-1], n_pixels))
+    span_key = np.repeat(span_key, n_pixels)
+    polygon = span_key // height
+    pixel = (span_key % height - row_lo) * width + col
+    n_band = n_rows * width
+
+    # Aggregate polygon values over each pixel
+    if agg == 'mean':
+        total = np.bincount(pixel, weights=values[polygon], minlength=n_band)
+        count = np.bincount(pixel, minlength=n_band)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            band = total / count
+
+    elif agg in ('min', 'max'):
+        band = np.full(n_band, np.inf if agg == 'min' else -np.inf)
+        ufunc = np.minimum if agg == 'min' else np.maximum
+        ufunc.at(band, pixel, values[polygon])
+        band[np.isinf(band)] = np.nan
+
+    elif agg == 'first':
+        first = np.full(n_band, values.shape[0])
+        np.minimum.at(first, pixel, polygon)
+        band = np.append(values, np.nan)[first]
+
+    return band.reshape(n_rows, width)
+
+
+def _hilbert_distances(x, y, p):
+    """ Distance of integer coordinates in [0, 2**p) along a Hilbert
+    curve, vectorized over all points
+    """
+    n = 2**p
+    x = x.copy()
+    y = y.copy()
+    d = np.zeros(x.shape[0], dtype=np.int64)
+
+    s = n // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+
+        # Rotate the quadrant so the curve continues from its entry point
+        flip = ~ry & rx
+        x[flip] = n - 1 - x[flip]
+        y[flip] = n - 1 - y[flip]
+        swap = ~ry
+        x[swap], y[swap] = y[swap], x[swap].copy()
+        s //= 2
+
+    return d
+
+
+def _shared_dir(shared_dir=None):
+    """ Returns the directory of shared meshes, by default a private
+    per-user directory in POSIX shared memory when available
+    """
+    if shared_dir is not None:
+        return shared_dir
+
+    root = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    shared_dir = os.path.join(root, 'polymesh-{}'.format(os.getuid()))
+    os.makedirs(shared_dir, mode=0o700, exist_ok=True)
+
+    # Never trust a directory another user created or can write to
+    info = os.stat(shared_dir)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError("Shared mesh directory '{}' is not private to this user".format(shared_dir))
+    return shared_dir
+
+
+def _projection_to_json(projection):
+    """ Describes a cartopy projection as JSON (its class name and the
+    state cartopy would pickle, with geometries as WKT), so shared
+    meshes never unpickle data
+    """
+    import shapely
+
+    def encode(value):
+        if isinstance(value, shapely.Geometry):
+            return {'__wkt__': value.wkt}
+        if isinstance(value, ccrs.Globe):
+            return {'__globe__': vars(value)}
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError("Cannot share projection attribute of type {}".format(type(value).__name__))
+
+    state = projection.__getstate__()
+    return json.dumps({'class': type(projection).__name__, 'state': state}, default=encode)
+
+
+def _projection_from_json(description):
+    """ Rebuilds a cartopy projection described by _projection_to_json"""
+    import shapely.wkt
+
+    def decode(value):
+        if '__wkt__' in value:
+            return shapely.wkt.loads(value['__wkt__'])
+        if '__globe__' in value:
+            return ccrs.Globe(**value['__globe__'])
+        return value
+
+    description = json.loads(description, object_hook=decode)
+    cls = getattr(ccrs, description['class'], None)
+    if not (isinstance(cls, type) and issubclass(cls, ccrs.CRS)):
+        raise ValueError("Unknown projection class '{}'".format(description['class']))
+
+    state = {key: tuple(value) if isinstance(value, list) else value
+             for key, value in description['state'].items()}
+    projection = cls.__new__(cls)
+    projection.__setstate__(state)
+    return projection
+
+
+def _transform_chunk(projection, x, y, out=None):
+    """ Transforms a chunk of longitude and latitude coordinates"""
+    coords = projection.transform_points(ccrs.PlateCarree(), x, y)[:, :2]
+    if out is None:
+        return coords
+    out[:] = coords
+    return out
+
+
+def _polygon_areas(coords, offsets):
+    """ Computes the (unsigned) area of each ragged polygon with
+    the shoelace formula
+    """
+    n_coords = coords.shape[0]
+    counts = np.diff(offsets)
+
+    # Index of the next node in each polygon (wrapping to the first)
+    next_index = np.arange(1, n_coords + 1)
+    next_index[offsets[1:] - 1] = offsets[:-1]
+
+    x = coords[:, 0].astype(np.float64)
+    y = coords[:, 1].astype(np.float64)
+    cross = x * y[next_index] - x[next_index] * y
+    return np.abs(np.add.reduceat(cross, offsets[:-1])) / 2 * (counts > 0)
+
+
+def _apply_operator(values, operator):
+    """ Applies a sparse operator to the leading axis of a block,
+    renormalizing the weights of each row over non NaN values
+    """
+    flat = values.reshape(values.shape[0], -1)
+    missing = np.isnan(flat) if flat.dtype.kind in 'fc' else None
+
+    if missing is None or not missing.any():
+        face_values = operator @ flat
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            face_values = (operator @ np.where(missing, 0, flat)) / (operator @ (~missing).astype(operator.dtype))
+
+    return face_values.reshape((operator.shape[0],) + values.shape[1:])
+
+
+def _take_rows(values, rows):
+    """ Takes rows of the leading axis of a block"""
+    return values[rows]
+
+
+def _reduce_ragged(values, reducer, element_index, offsets):
+    """ Gathers the values of each polygon's elements and applies a
+    ragged reducer over the leading axis of a block
+    """
+    gathered = values[element_index].reshape(element_index.shape[0], -1)
+    face_values = reducer(gathered, offsets)
+    return face_values.reshape((offsets.shape[0] - 1,) + values.shape[1:])
+
+
+def _ragged_min(values, offsets):
+    """ Minimum of each ragged row, ignoring NaN values"""
+    return np.fmin.reduceat(values, offsets[:-1], axis=0)
+
+
+def _ragged_max(values, offsets):
+    """ Maximum of each ragged row, ignoring NaN values"""
+    return np.fmax.reduceat(values, offsets[:-1], axis=0)
+
+
+def _ragged_median(values, offsets):
+    """ Median of each ragged row, ignoring NaN values, computed on a
+    NaN padded [n_rows x max_count x ...] array
+    """
+    counts = np.diff(offsets)
+    position = np.arange(values.shape[0]) - np.repeat(offsets[:-1], counts)
+    padded = np.full((counts.shape[0], counts.max(initial=0)) + values.shape[1:], np.nan)
+    padded[np.repeat(np.arange(counts.shape[0]), counts), position] = values
+
+    with warnings.catch_warnings():
+        # All NaN rows give NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmedian(padded, axis=1)
+
+
+def _reducer_dtype(reducer, dtype):
+    """ Returns the output dtype of a reducer, None when unknown"""
+    if reducer in _OPERATOR_WEIGHTS or reducer == 'median':
+        return np.result_type(dtype, np.float64)
+    if reducer in ('min', 'max', 'nearest'):
+        return dtype
+    return None
+
+
+# Ragged Reducers of gathered node or edge values, each called with the
+# values [n_entries x n_columns] and offsets [n_polygons + 1]
+REDUCERS = {'min': _ragged_min,
+            'max': _ragged_max,
+            'median': _ragged_median}
+
+# Weighted Mean Reducers, applied as sparse operators
+_OPERATOR_WEIGHTS = ('mean', 'area_mean', 'length_mean')
+
+
+def _geometry_partition(geometry, face_values, start, column='faces'):
+    """ Creates a GeoDataFrame partition indexed from start"""
+    index = pd.RangeIndex(start, start + face_values.shape[0])
+    return sp.GeoDataFrame({'geometry': geometry, column: face_values}, index=index)
+
+
+def _valid_face_nodes(face_nodes, fill_value=None):
+    """ Returns a mask of face node entries that index real nodes,
+    excluding negative, NaN (decoded) and fill value entries
+    """
+    valid = face_nodes >= 0
+    if fill_value is not None:
+        valid &= face_nodes != fill_value
+    return valid
+
+
+def _counts_to_offsets(counts):
+    """ Converts per-polygon node counts to offsets [0, c1, c1+c2, ...]"""
+    offsets = np.zeros(counts.shape[0] + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _ragged_take(offsets, rows):
+    """ Selects rows of a ragged array, returning the flat element
+    index of the selected rows and their new offsets
+    """
+    counts = offsets[1:][rows] - offsets[:-1][rows]
+    new_offsets = _counts_to_offsets(counts)
+    element_index = np.arange(new_offsets[-1]) + np.repeat(offsets[:-1][rows] - new_offsets[:-1], counts)
+    return element_index, new_offsets
 
 
+def _polygons_to_arrow(coords, offsets):
+    """ Builds the nested PyArrow list array used by a spatialpandas
+    MultiPolygonArray directly from ragged polygon coordinates, where
+    each polygon is a single part with a single ring
+    Parameters
+    ----------
+    coords : ndarray
+        Polygon node coordinates [n_polygon_nodes x 2]
+    offsets : ndarray
+        Offsets of each polygon into coords
+
+    Returns
+    -------
+    parr : pa.ListArray
+        Polygons as list<list<list<double>>> (parts, rings, coordinates)
+    """
+    n_polygons = offsets.shape[0] - 1
+    counts = np.diff(offsets)
+
+    # Closed Rings repeat their first node, shifting each ring by one node per previous ring
+    ring_offsets = offsets + np.arange(n_polygons + 1)
+    closed_coords = np.empty((ring_offsets[-1], 2), dtype=coords.dtype)
+    closed_coords[np.arange(offsets[-1]) + np.repeat(np.arange(n_polygons), counts)] = coords
+    closed_coords[ring_offsets[1:] - 1] = coords[offsets[:-1]]
+
+    # Every polygon has exactly one part and one ring
+    part_offsets = np.arange(n_polygons + 1, dtype=np.int32)
+
+    # Create a PyArrow array with our Polygons
+    _parr3 = pa.ListArray.from_arrays(pa.array(2 * ring_offsets.astype(np.int32)), pa.array(closed_coords.ravel()))
+    _parr2 = pa.ListArray.from_arrays(pa.array(part_offsets), _parr3)
+    parr = pa.ListArray.from_arrays(pa.array(part_offsets), _parr2)
+
+    return parr
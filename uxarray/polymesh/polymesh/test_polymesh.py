@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import xarray as xr
+import cartopy.crs as ccrs
+import datashader as ds
+import pytest
+
+import polymesh
+from polymesh import Polymesh
+
+data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'misc', 'data'))
+
+
+class Grid:
+    """UGRID dataset with the variable names Polymesh reads (as given
+    by a uxarray Grid)"""
+
+    def __init__(self, name):
+        self.ds = xr.open_dataset(os.path.join(data_path, name))
+        self.ds['Mesh2_node_x'] = (self.ds['Mesh2_node_x'] + 180) % 360 - 180
+        self.ds_var_names = {var: var for var in ['Mesh2_node_x', 'Mesh2_node_y', 'Mesh2_face_nodes']}
+
+        node_dim = self.ds['Mesh2_node_x'].dims[0]
+        self.ds['random'] = (node_dim, np.random.default_rng(0).random(self.ds.sizes[node_dim]))
+
+
+@pytest.fixture(params=[('outCSne30.ug', ccrs.Robinson()), ('outRLL1deg.ug', ccrs.Orthographic())],
+                ids=['outCSne30-Robinson', 'outRLL1deg-Orthographic'])
+def mesh(request):
+    name, projection = request.param
+    mesh = Polymesh(Grid(name), projection=projection)
+    mesh.construct_mesh()
+    return mesh
+
+
+def test_partition_bounds_are_precomputed(mesh, monkeypatch):
+    calls = []
+    geometry_partition = polymesh._geometry_partition
+    monkeypatch.setattr(polymesh, '_geometry_partition', lambda *args: calls.append(args) or geometry_partition(*args))
+
+    ddf = mesh.partitioned_mesh('random', {}, npartitions=8)
+    partition_bounds = ddf._partition_bounds['geometry']
+    assert partition_bounds.shape == (8, 4)
+    assert np.all(np.isfinite(partition_bounds.values))
+
+    # Culling uses the seeded bounds without computing any partition
+    x0, y0, x1, y1 = partition_bounds.values[0]
+    assert ddf.cx_partitions[x0:x1, y0:y1].npartitions >= 1
+    assert calls == []
+
+    # Seeded bounds match the bounds of the computed partitions
+    for partition in range(ddf.npartitions):
+        total_bounds = ddf.get_partition(partition).compute()['geometry'].total_bounds
+        assert np.allclose(total_bounds, partition_bounds.values[partition])
+    assert len(calls) == ddf.npartitions
+
+
+def coverage(gdf, canvas):
+    agg = canvas.polygons(gdf.assign(faces=1.0), 'geometry', agg=ds.max('faces'))
+    return ~np.isnan(agg.values)
+
+
+def test_pyramid_levels_cover_mesh(mesh):
+    pyramid = mesh.build_pyramid()
+    coords, _ = mesh.rendered_polygons()
+    coords = coords[np.isfinite(coords).all(axis=1)]
+    x_range = (coords[:, 0].min(), coords[:, 0].max())
+    y_range = (coords[:, 1].min(), coords[:, 1].max())
+
+    for level in pyramid[1:]:
+        # Four pixels per cell, so gaps narrower than a cell show up
+        width = 4 * int(np.ceil((x_range[1] - x_range[0]) / level['cell_size']))
+        height = int(width * (y_range[1] - y_range[0]) / (x_range[1] - x_range[0]))
+        canvas = ds.Canvas(width, height, x_range=x_range, y_range=y_range)
+        full, coarse = coverage(mesh.gdf, canvas), coverage(level['gdf'], canvas)
+
+        # Datashader also fills pixels touched by slanted edges, which cell
+        # boxes do not have, so allow the coarse coverage a one pixel margin
+        padded = np.pad(coarse, 1)
+        margin = np.any([padded[1 + dy:padded.shape[0] - 1 + dy, 1 + dx:padded.shape[1] - 1 + dx]
+                         for dy in (-1, 0, 1) for dx in (-1, 0, 1)], axis=0)
+        assert not np.any(full & ~margin)
+
+
+def test_attach_rebuilds_projection_without_pickle(mesh, tmp_path):
+    mesh.share('mesh', shared_dir=str(tmp_path))
+    attached = Polymesh.attach('mesh', shared_dir=str(tmp_path))
+
+    assert attached.projection == mesh.projection
+    assert attached.projection.boundary.equals(mesh.projection.boundary)
+    assert np.array_equal(attached.polygon_coords, mesh.polygon_coords, equal_nan=True)
+
+
+def test_attach_rejects_unknown_projection_class():
+    description = polymesh._projection_to_json(ccrs.Robinson()).replace('"Robinson"', '"Globe"')
+    with pytest.raises(ValueError):
+        polymesh._projection_from_json(description)
@@ -1,9 +1,8 @@
 import numpy as np
 import xarray as xr
-import pandas as pd
 import dask.array as da
-from dask import delayed, compute
-from dask.dataframe import from_pandas
+from dask import delayed
+from dask.dataframe import from_delayed
 import scipy.spatial
 import spatialpandas as sp
 import cartopy.crs as ccrs
@@ -74,6 +73,9 @@ class poly_plot():
         # Saved Index for Fixing Cells
         self.drop_index = None
 
+        # Original Face of each Fixed Polygon (computed once by fix_cells)
+        self.face_index = None
+
         
 
     def data_mesh(self, name, dims, method="Mean"):
@@ -104,11 +106,30 @@ class poly_plot():
         else:
             self.face_array = None
 
-        self.df['faces'] = self.face_array
-        self.fix_cells()
+        # Split topology is computed once, later calls only gather the new face values
+        if self.face_index is None:
+            self.fix_cells()
+        else:
+            self.update_faces()
     
         return self.df_fixed
 
+    def update_faces(self):
+        """ Gathers the current face values into a new fixed mesh, reusing
+        the geometry and face index saved by fix_cells (frames returned by
+        earlier calls keep their values)
+
+        Outputs:
+        ----------
+        df_fixed: GeoDataFrame
+            Dataframe containing fixed polygons and their face values
+        """
+        faces = None if self.face_array is None else self.face_array[self.face_index]
+        self.df_fixed = sp.GeoDataFrame({'geometry': self.df_fixed['geometry'].values,
+                                         'faces': faces})
+
+        return self.df_fixed
+
     def construct_mesh(self):
         """ Constructs a Polygon Mesh suitable for rendering with Datashader
 
@@ -179,6 +200,9 @@ class poly_plot():
 
         # Used for Original and PyGeos Approaches above
         self.df = sp.GeoDataFrame({'geometry': polygons})
+
+        # New geometry, fixed cells are recomputed on the next data_mesh
+        self.face_index = None
         
         
         
@@ -198,131 +222,30 @@ class poly_plot():
         
 
     def fix_cells(self):
-        '''Fixes cells near the edges of the map (around +-180 lon)
+        '''Fixes cells near the edges of the map (around +-180 lon), assembling
+        the fixed mesh in a single pass into preallocated coordinate buffers
         
         Inputs:
         ----------
-        df : GeoDataFrame
-            Dataframe containing original polygons reconstructed from input data 
+        polygon_array : ndarray
+            Polygon coordinates reconstructed from input data
+            [n_faces x n_face_nodes x 2]
 
         Outputs:
         ----------
         df_fixed: GeoDataFrame
-            Dataframe containing fixed polygons based on edge value wrap around conditions
+            Dataframe containing fixed polygons based on edge value wrap around conditions,
+            the kept cells in their original order followed by the left and right cells
+            of each split cell
+        face_index : ndarray
+            Original face of each polygon in df_fixed (for hover and picking), saved
+            so new data only needs a gather (see update_faces)
         '''
-        #n_poly = self.df['geometry'].values.shape[0]
-        #print(self.df['geometry'].values.buffer_values.shape)
-        #poly_data = self.df['geometry'].values.buffer_values.reshape(self.n_faces, 2*self.n_face_nodes)
-        poly_data = np.zeros((self.n_faces, 2*self.n_face_nodes))
-        poly_data[:, 0::2] = self.polygon_array[:, :, 0]
-        poly_data[:, 1::2] = self.polygon_array[:, :, 1]
-        
-        face_data = self.df['faces'].values
-
-        # Positive and Negative Value to ignore sign changes in x values
-        center_buffer = 5
-
-        # Get x values
-        x = poly_data[:, ::2]
-        x_abs = np.abs(poly_data[:, ::2])
-
-        # Find violater cells (Sign Change in x values)
-        out_left = np.all((-x - x_abs) == 0, axis=1)
-        out_right = np.all((x - x_abs) == 0, axis=1)
-        out = out_left | out_right
-
-
-        # Index of violater cells
-        drop_index = np.arange(0, self.n_faces, 1)
-        drop_index = drop_index[~out]
-
-        # Get cells to fix
-        poly_to_fix = poly_data[drop_index]
-        face_to_fix = face_data[drop_index]
-
-        # Exclude any center cells (+-center_buffer) x
-        corrected_index = np.any(np.abs(poly_to_fix[:, ::2]) < center_buffer, axis=1)
-        poly_to_fix = poly_to_fix[~corrected_index]
-        face_to_fix = face_to_fix[~corrected_index]
-        drop_index = drop_index[~corrected_index]
-
-        poly_list = []
-        face_list = []
-
-        # Split each violater cell into two cells
-        for face, poly in zip(face_to_fix, poly_to_fix):
-            poly_left = poly.copy()
-            poly_right = poly.copy()
-             
-            # Start in RHS
-            if poly[0] > 0:
-                x_remain_index = poly[2::2] > 0
-                poly_right[2::2][~x_remain_index] = poly[2::2][~x_remain_index] + 360 
-                
-                poly_left[0] = poly[0] - 360
-                poly_left[2::2][x_remain_index] = poly[2::2][x_remain_index] - 360
-
-                poly_list.extend([poly_left, poly_right])
-                face_list.extend([face, face])
-                continue
-            # Start in LHS
-            elif poly[0] < 0:
-                x_remain_index = poly[2::2] < 0
-                poly_left[2::2][~x_remain_index] = poly[2::2][~x_remain_index] - 360
-
-                poly_right[0] = poly[0] + 360
-                poly_right[2::2][x_remain_index] = poly[2::2][x_remain_index] + 360
-                
-                poly_list.extend([poly_left, poly_right])
-                face_list.extend([face, face])
-                continue
-            # Ignore
-            else:
-                continue
-
-        # Drop Violater Cells
-        df_droped = self.df.drop(drop_index)
-
-        # Create polygon and face arrays to add to df
-        poly_insert = np.array(poly_list)
-        poly_insert = poly_insert.reshape(len(poly_list), self.n_face_nodes, 2)
+        geometry, self.face_index, self.drop_index = _fix_polygons(self.polygon_array)
 
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        geo = pg.polygons(poly_insert)
+        self.df_fixed = sp.GeoDataFrame({'geometry': geometry})
 
-        arr_flat, part_indices = pg.get_parts(geo, return_index=True)
-        offsets1 = np.insert(np.bincount(part_indices).cumsum(), 0, 0)
-        arr_flat2, ring_indices = pg.geometry.get_rings(arr_flat, return_index=True)
-        offsets2 = np.insert(np.bincount(ring_indices).cumsum(), 0, 0)
-        coords, indices = pg.get_coordinates(arr_flat2, return_index=True)
-        offsets3 = np.insert(np.bincount(indices).cumsum(), 0, 0)
-
-        coords_flat = coords.ravel()
-        offsets3 *= 2
-
-        # create a pyarrow array from this
-        _parr3 = pa.ListArray.from_arrays(pa.array(offsets3), pa.array(coords_flat))
-        _parr2 = pa.ListArray.from_arrays(pa.   array(offsets2), _parr3)
-        parr = pa.ListArray.from_arrays(pa.array(offsets1), _parr2)
-
-        polygons = sp.geometry.MultiPolygonArray(parr)
-        
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Create new df with left and right cells
-        df_insert = sp.GeoDataFrame({'geometry': polygons,
-                                    'faces': face_list})
-
-
-        # polygons = pg.polygons(poly_insert)
-        # df_insert = pd.DataFrame({"geometry": polygons, "faces" : face_list})
-        # df_insert = df_insert.astype({'geometry':'geos'})
-        # df_insert = df_insert.geos.to_geopandas(geometry='geometry')
-       
-
-        # Join existing and new df
-        self.df_fixed = pd.concat([df_insert, df_droped], ignore_index=True)
-        
-        return self.df_fixed
+        return self.update_faces()
 
     def mesh(self):
         '''Return Polygon Mesh For Plotting with Datashader'''
@@ -360,8 +283,9 @@ class poly_plot():
 
 
 class poly_plot_dask():
-    def __init__(self, ds=None, ugrid_dict = None, x=None, y=None, face_nodes=None):
-        """ Constructs a Poly Plot Object based on UGRID data 
+    def __init__(self, ds=None, ugrid_dict = None, x=None, y=None, face_nodes=None, chunks=None):
+        """ Constructs a Poly Plot Object based on UGRID data, building the
+        polygon mesh lazily with one task per chunk of faces
 
         Args:
         ----------
@@ -376,40 +300,48 @@ class poly_plot_dask():
         face_nodes : ndarray
             2D array containing each polygon's face edge node indexes
             [n_faces x n_face_nodes]
+        chunks : int or string
+            Number of faces in each chunk (and mesh partition), defaults to
+            the chunks of dask backed face nodes, otherwise 'auto'
 
         """
 
-        # UGRID Data (coordinates and faces)
+        # UGRID Data (coordinates and faces), kept lazy when backed by dask
         if ds is not None and ugrid_dict is not None:
-            self.x = ds[ugrid_dict['Mesh2_node_x']].values
-            self.y = ds[ugrid_dict['Mesh2_node_y']].values
-            self.face_nodes = ds[ugrid_dict['Mesh2_face_nodes']].values
-            self.n_faces, self.n_face_nodes = self.face_nodes.shape
-            self.n_mesh_nodes = self.x.shape[0]
-            self.index = self.face_nodes.astype(int)
+            self.x = ds[ugrid_dict['Mesh2_node_x']].data
+            self.y = ds[ugrid_dict['Mesh2_node_y']].data
+            self.face_nodes = ds[ugrid_dict['Mesh2_face_nodes']].data
         else:
             self.x, self.y = x, y
             self.face_nodes = face_nodes
-            self.n_faces, self.n_face_nodes = face_nodes.shape
-            self.n_mesh_nodes = x.shape[0]
-            self.index = face_nodes.astype(int)
-        
-        # Convert To Dask
-        self.x = da.from_array(self.x, chunks=('auto'))
-        self.y = da.from_array(self.y, chunks=('auto'))
-        self.face_nodes = da.from_array(self.face_nodes, chunks=('auto', -1))
-        self.index = da.from_array(self.index, chunks=('auto', -1))
-  
+
+        self.n_faces, self.n_face_nodes = self.face_nodes.shape
+        self.n_mesh_nodes = self.x.shape[0]
+
+        # Convert To Dask (faces are chunked, every task reads all nodes)
+        self.x = da.asarray(self.x).rechunk(-1)
+        self.y = da.asarray(self.y).rechunk(-1)
+        self.face_nodes = da.asarray(self.face_nodes)
+        if chunks is None and self.face_nodes.numblocks[0] == 1:
+            chunks = 'auto'
+        self.face_nodes = self.face_nodes.rechunk((chunks if chunks is not None else self.face_nodes.chunks[0], -1))
+        self.index = self.face_nodes.astype(int)
+
+        # Polygon coordinates of each chunk of faces [n_faces x n_face_nodes x 2]
+        self.polygons = da.blockwise(_gather_polygons, 'ijk',
+                                     self.index, 'ij', self.x, 'n', self.y, 'n',
+                                     new_axes={'k': 2}, concatenate=True, dtype=float)
+
         # Polygon Mesh Data (polygons and faces)
         self.df = None
         self.df_fixed = None
         self.face_array = None
-        self.poly_array = np.zeros((self.n_faces, 2*self.n_face_nodes))
 
         
 
     def set_data(self, data, method="Mean"):
-        """ Calculates the face value of each reconstructred polygon
+        """ Calculates the face value of each reconstructred polygon,
+        lazily and chunked like the faces
 
         Args:
         ----------
@@ -420,163 +352,77 @@ class poly_plot_dask():
 
         Outputs:
         ----------
-        face_array : ndarray
+        face_array : dask.array
             Face Values for each Polygon
 
         """
 
-        if method == "Mean":    
-            self.face_array = da.mean(data[self.index], axis=1)
+        if method == "Mean":
+            data = da.asarray(data).rechunk(-1)
+            self.face_array = da.blockwise(_face_mean, 'i', self.index, 'ij', data, 'n',
+                                           concatenate=True, dtype=float)
         
         else:
             self.face_array = None
 
     def to_poly_mesh(self):
-        """ Constructs a Polygon Mesh suitable for rendering with Datashader
+        """ Constructs a Polygon Mesh suitable for rendering with Datashader,
+        as a DaskGeoDataFrame with one lazily built partition per chunk of faces
 
         Inputs:
         ----------
-        x : ndarray
-            1D array containing x coordinates of face edge nodes
-            [1 x n_mesh_nodes]
-        y : ndarray
-            1D array containing y coordinates of face edge nodes
-            [1 x n_mesh_nodes]
-        face_nodes : ndarray
-            2D array containing each polygon's face edge node indexes
-            [n_faces x n_face_nodes]
+        polygons : dask.array
+            Polygon coordinates [n_faces x n_face_nodes x 2]
+        face_array : dask.array
+            Face Values for each Polygon
 
         Outputs:
         ----------
-        poly_array : ndarray
-            Array containing each polygon's face edge node coordinates 
-            [n_faces x 2 * n_face_nodes]
-            [x1, y1, x2, y2, x3, y3, ...... xn, yn]
-        df : GeoDataFrame
+        df : DaskGeoDataFrame
             Dataframe containing original polygons reconstructed from input data 
             "geometry" : Polygon Coordinates
             "faces" : Polygon Fill Values       
         """
-        # Point Index
-        p_index = np.arange(0, 2*self.n_face_nodes)
-
-        # Vectorized Approach
-        for n, i, j in zip(range(self.n_face_nodes), p_index[::2], p_index[1::2]):
-            self.poly_array[:, i] = self.x[self.index[:, n]]
-            self.poly_array[:, j] = self.y[self.index[:, n]]
-        
-        # Create Polygon and Face Dataframe
-        self.poly_array = self.poly_array.reshape((self.n_faces, 1, 2*self.n_face_nodes))
-
-        #polygons = sp.geometry.PolygonArray(self.poly_array.tolist())
-        polygons = self.poly_array
-
-        if self.face_array is None:
-            self.df = sp.GeoDataFrame({'geometry': polygons})
-        else:
-            self.df = sp.GeoDataFrame({'geometry': polygons,
-                                       'faces': self.face_array.tolist()})
-
-        self.df = from_pandas(self.df, npartitions=4)
+        self.df = self._mesh_partitions(_polygon_partition)
 
         # Correct Edge Cells 
         self.fix_cells()
 
     def fix_cells(self):
-        '''Fixes cells near the edges of the map (around +-180 lon)
-        
+        '''Fixes cells near the edges of the map (around +-180 lon), splitting
+        the violater cells of each chunk of faces independently
+
         Inputs:
         ----------
-        df : GeoDataFrame
-            Dataframe containing original polygons reconstructed from input data 
+        polygons : dask.array
+            Polygon coordinates [n_faces x n_face_nodes x 2]
 
         Outputs:
         ----------
-        df_fixed: GeoDataFrame
-            Dataframe containing fixed polygons based on edge value wrap around conditions
+        df_fixed: DaskGeoDataFrame
+            Dataframe containing fixed polygons based on edge value wrap around
+            conditions, each partition holding its kept cells (in order) followed
+            by the left and right halves of its split cells
         '''
-        n_poly = self.df['geometry'].values.shape[0]
-        poly_data = self.df['geometry'].values.buffer_values.reshape(n_poly, 2*self.n_face_nodes)
-        face_data = self.df['faces'].values
-
-        # Positive and Negative Value to ignore sign changes in x values
-        center_buffer = 5
-
-        # Get x values
-        x = poly_data[:, ::2]
-        x_abs = np.abs(poly_data[:, ::2])
-
-        # Find violater cells (Sign Change in x values)
-        out_left = np.all((-x - x_abs) == 0, axis=1)
-        out_right = np.all((x - x_abs) == 0, axis=1)
-        out = out_left | out_right
-
-        # Index of violater cells
-        drop_index = np.arange(0, n_poly, 1)
-        drop_index = drop_index[~out]
-
-        # Get cells to fix
-        poly_to_fix = poly_data[drop_index]
-        face_to_fix = face_data[drop_index]
-
-        # Exclude any center cells (+-center_buffer) x
-        corrected_index = np.any(np.abs(poly_to_fix[:, ::2]) < center_buffer, axis=1)
-        poly_to_fix = poly_to_fix[~corrected_index]
-        face_to_fix = face_to_fix[~corrected_index]
-        drop_index = drop_index[~corrected_index]
-
-        poly_list = []
-        face_list = []
-
-        # Split each violater cell into two cells
-        for face, poly in zip(face_to_fix, poly_to_fix):
-            poly_left = poly.copy()
-            poly_right = poly.copy()
-             
-            # Start in RHS
-            if poly[0] > 0:
-                x_remain_index = poly[2::2] > 0
-                poly_right[2::2][~x_remain_index] = poly[2::2][~x_remain_index] + 360 
-                
-                poly_left[0] = poly[0] - 360
-                poly_left[2::2][x_remain_index] = poly[2::2][x_remain_index] - 360
-
-                poly_list.extend([poly_left, poly_right])
-                face_list.extend([face, face])
-                continue
-            # Start in LHS
-            elif poly[0] < 0:
-                x_remain_index = poly[2::2] < 0
-                poly_left[2::2][~x_remain_index] = poly[2::2][~x_remain_index] - 360
-
-                poly_right[0] = poly[0] + 360
-                poly_right[2::2][x_remain_index] = poly[2::2][x_remain_index] + 360
-                
-                poly_list.extend([poly_left, poly_right])
-                face_list.extend([face, face])
-                continue
-            # Ignore
-            else:
-                continue
-
-        # Drop Violater Cells
-        df_droped = self.df.drop(drop_index)
-
-        # Create polygon and face arrays to add to df
-        poly_insert = np.array(poly_list)
-        poly_insert = poly_insert.reshape(len(poly_list), 1, 2*self.n_face_nodes)
-
-        # Create new df with left and right cells
-        polygons = sp.geometry.PolygonArray(poly_insert.tolist())
-        df_insert = sp.GeoDataFrame({'geometry': polygons,
-                                    'faces': face_list})
-    
-        # Join existing and new df
-        self.df_fixed = pd.concat([df_insert, df_droped], ignore_index=True)
-        self.df_fixed = from_pandas(self.df_fixed, npartitions=4)
-        
+        self.df_fixed = self._mesh_partitions(_fixed_partition)
+
         return self.df_fixed
 
+    def _mesh_partitions(self, partition):
+        '''Builds a DaskGeoDataFrame from a partition function applied to each
+        chunk of polygons (and face values)'''
+        polygon_blocks = self.polygons.to_delayed().ravel()
+        if self.face_array is None:
+            face_blocks = [None] * len(polygon_blocks)
+        else:
+            face_blocks = self.face_array.to_delayed().ravel()
+
+        meta = partition(np.zeros((0, self.n_face_nodes, 2)),
+                         None if self.face_array is None else np.zeros(0))
+
+        return from_delayed([delayed(partition)(polygon_block, face_block)
+                             for polygon_block, face_block in zip(polygon_blocks, face_blocks)], meta=meta)
+
     def mesh(self):
         '''Return Polygon Mesh For Plotting with Datashader'''
         return self.df_fixed
@@ -586,3 +432,103 @@ class poly_plot_dask():
         return 
 
 
+def _gather_polygons(index, x, y):
+    '''Gathers the polygon coordinates of a chunk of faces'''
+    polygons = np.empty(index.shape + (2,))
+    polygons[:, :, 0] = x[index]
+    polygons[:, :, 1] = y[index]
+    return polygons
+
+
+def _face_mean(index, data):
+    '''Mean of the face node values of a chunk of faces'''
+    return data[index].mean(axis=1)
+
+
+def _polygon_partition(polygons, faces=None):
+    '''Creates a GeoDataFrame partition from a chunk of polygons'''
+    df = sp.GeoDataFrame({'geometry': _polygons_to_geometry(polygons)})
+    if faces is not None:
+        df['faces'] = faces
+    return df
+
+
+def _fixed_partition(polygons, faces=None):
+    '''Creates a GeoDataFrame partition from a chunk of polygons, replacing
+    each violater cell (around +-180 lon) with a left and right cell'''
+    geometry, face_index, _ = _fix_polygons(polygons)
+
+    df = sp.GeoDataFrame({'geometry': geometry})
+    if faces is not None:
+        df['faces'] = faces[face_index]
+    return df
+
+
+def _fix_polygons(polygons):
+    '''Splits each violater cell (sign change in x values around +-180 lon)
+    into a left and right cell, writing the kept cells (in order) followed by
+    the split cells into a single preallocated ring buffer
+
+    Outputs:
+    ----------
+    geometry : MultiPolygonArray
+        Fixed polygons
+    face_index : ndarray
+        Original cell of each fixed polygon
+    drop_index : ndarray
+        Violater cells (cells starting at x = 0 are dropped without being split)
+    '''
+    n_face_nodes = polygons.shape[1]
+    x = polygons[:, :, 0]
+
+    # Positive and Negative Value to ignore sign changes in x values
+    center_buffer = 5
+
+    # Find violater cells (Sign Change in x values), excluding center cells
+    out = np.all(x <= 0, axis=1) | np.all(x >= 0, axis=1)
+    fix = ~out & ~np.any(np.abs(x) < center_buffer, axis=1)
+    keep_index = np.flatnonzero(~fix)
+    split_index = np.flatnonzero(fix & (x[:, 0] != 0))
+
+    # Start in RHS: move (+) x to the left cell and (-) x to the right cell
+    # Start in LHS: move (+/0) x to the left cell and (-) x to the right cell
+    x_split = x[split_index]
+    start_right = x_split[:, :1] > 0
+    to_left = np.where(start_right, x_split > 0, x_split >= 0)
+    to_right = np.where(start_right, x_split <= 0, x_split < 0)
+
+    # Closed rings of the kept cells followed by each left and right cell
+    n_keep = keep_index.shape[0]
+    rings = np.empty((n_keep + 2 * split_index.shape[0], n_face_nodes + 1, 2))
+    rings[:n_keep, :-1] = polygons[keep_index]
+    rings[n_keep::2, :-1] = polygons[split_index]
+    rings[n_keep + 1::2, :-1] = polygons[split_index]
+    rings[n_keep::2, :-1, 0] -= 360 * to_left
+    rings[n_keep + 1::2, :-1, 0] += 360 * to_right
+    rings[:, -1] = rings[:, 0]
+
+    face_index = np.concatenate((keep_index, np.repeat(split_index, 2)))
+
+    return _rings_to_geometry(rings), face_index, np.flatnonzero(fix)
+
+
+def _polygons_to_geometry(polygons):
+    '''Builds a MultiPolygonArray (one closed ring per polygon) from a
+    [n_polygons x n_face_nodes x 2] coordinate array'''
+    rings = np.empty((polygons.shape[0], polygons.shape[1] + 1, 2))
+    rings[:, :-1] = polygons
+    rings[:, -1] = polygons[:, 0]
+    return _rings_to_geometry(rings)
+
+
+def _rings_to_geometry(rings):
+    '''Builds a MultiPolygonArray directly on the buffer of closed rings
+    [n_polygons x n_ring_nodes x 2], without copying the coordinates'''
+    n_polygons, n_ring_nodes = rings.shape[:2]
+
+    offsets = np.arange(n_polygons + 1)
+    _parr3 = pa.ListArray.from_arrays(pa.array(offsets * 2 * n_ring_nodes), pa.array(rings.ravel()))
+    _parr2 = pa.ListArray.from_arrays(pa.array(offsets), _parr3)
+    parr = pa.ListArray.from_arrays(pa.array(offsets), _parr2)
+
+    return sp.geometry.MultiPolygonArray(parr)
@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import time
+import numpy as np
+import xarray as xr
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+
+module_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from helpers import mpl_polygons
+
+data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+grids = {'outCSne30': data_path + "/misc/data/outCSne30.ug",
+         'outRLL1deg': data_path + "/misc/data/outRLL1deg.ug"}
+n_faces = 1_000_000
+
+
+def test(func, n_runs=3):
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        result = func()
+    return (time.perf_counter() - start) / n_runs, result
+
+
+def list_polygons(node_x, node_y, face_nodes, face_values):
+    # Per-face Python lists, the approach mpl_polygons replaces
+    polygons = [list(zip(node_x[face[face >= 0]], node_y[face[face >= 0]])) for face in face_nodes]
+    collection = PolyCollection(polygons)
+    collection.set_array(face_values)
+    return collection
+
+
+def render(collection):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.add_collection(collection)
+    ax.set_xlim(-180, 180)
+    ax.set_ylim(-90, 90)
+    fig.savefig(io.BytesIO(), format='png', dpi=100)
+    plt.close(fig)
+
+
+for name, path in grids.items():
+    try:
+        grid_ds = xr.open_dataset(path)
+    except Exception as e:
+        print("{}: unable to open grid ({})".format(name, e))
+        continue
+
+    # Repeat the grid's faces to reach a 1M face mesh
+    node_x = grid_ds['Mesh2_node_x'].values
+    node_y = grid_ds['Mesh2_node_y'].values
+    face_nodes = grid_ds['Mesh2_face_nodes'].values
+    face_nodes = np.nan_to_num(face_nodes, nan=-1).astype(int)
+    face_nodes = np.tile(face_nodes, (int(np.ceil(n_faces / face_nodes.shape[0])), 1))[:n_faces]
+    timesteps = np.random.rand(3, n_faces)
+
+    t_list, _ = test(lambda: list_polygons(node_x, node_y, face_nodes, timesteps[0]), n_runs=1)
+    t_array, collection = test(lambda: mpl_polygons(node_x, node_y, face_nodes, timesteps[0]))
+    paths = collection.get_paths()
+    t_update, _ = test(lambda: [collection.set_array(values) for values in timesteps[1:]])
+    assert collection.get_paths() is paths
+    t_render, _ = test(lambda: render(collection), n_runs=1)
+
+    print("{} ({} faces, {} polygons): list {:.4f}s, mpl_polygons {:.4f}s, speedup {:.1f}x, "
+          "set_array {:.4f}s per timestep, render {:.4f}s".format(
+              name, n_faces, len(paths), t_list, t_array, t_list / t_array,
+              t_update / (timesteps.shape[0] - 1), t_render))
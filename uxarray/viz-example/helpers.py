@@ -1,5 +1,6 @@
 import numpy as np
 import shapely
+from matplotlib.collections import PolyCollection
 
 
 def ugrid_to_polygon_coords(
@@ -8,41 +9,134 @@ def ugrid_to_polygon_coords(
         Mesh2_face_nodes: np.ndarray,
         fill_value=None
 ) -> tuple[np.ndarray, np.ndarray]:
-    """
-    to-do
-    """
+    """Gathers the (x) and (y) vertices of each face into dense
+    arrays, repeating the last valid vertex of faces padded with
+    fill values
+    Parameters
+    ----------
+    Mesh2_node_x : np.ndarray
+        (x) coordinate of each node
+    Mesh2_node_y : np.ndarray
+        (y) coordinate of each node
+    Mesh2_face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    fill_value : int, optional
+        Value of padded face node entries (negative and NaN entries
+        are always treated as fill values)
 
-    # handle fill value
-    face_nodes = Mesh2_face_nodes.astype(int)
+    Returns
+    -------
+    polygon_x : np.ndarray
+        (x) coordinate of each polygon vertex [n_faces x n_max_face_nodes]
+    polygon_y : np.ndarray
+        (y) coordinate of each polygon vertex [n_faces x n_max_face_nodes]
+    """
+    face_nodes = _fill_face_nodes(Mesh2_face_nodes, fill_value)
     polygon_x = Mesh2_node_x[face_nodes]
     polygon_y = Mesh2_node_y[face_nodes]
     return polygon_x, polygon_y
 
 
-def close_polygons(
-                    face_nodes : np.ndarray,
-) -> np.ndarray:
-    """Pads the (x) and (y) vertices representing
-    a polygon (face) to form a closed polygons
+def ugrid_to_ragged_polygon_coords(
+        Mesh2_node_x: np.ndarray,
+        Mesh2_node_y: np.ndarray,
+        Mesh2_face_nodes: np.ndarray,
+        fill_value=None,
+        closed=True
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gathers the (x) and (y) vertices of each face into contiguous
+    buffers, skipping fill values, with a single gather over all
+    vertices (ready for Arrow, matplotlib or datashader)
+    Parameters
+    ----------
+    Mesh2_node_x : np.ndarray
+        (x) coordinate of each node
+    Mesh2_node_y : np.ndarray
+        (y) coordinate of each node
+    Mesh2_face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    fill_value : int, optional
+        Value of padded face node entries (negative and NaN entries
+        are always treated as fill values)
+    closed : bool, optional
+        Repeat the first vertex of each face to close its ring
+
+    Returns
     -------
     polygon_x : np.ndarray
-        (x) coordinate of each polygon vertex
-
+        (x) coordinate of each polygon vertex [n_vertices]
     polygon_y : np.ndarray
-        (y) coordinate of each polygon vertex
+        (y) coordinate of each polygon vertex [n_vertices]
+    offsets : np.ndarray
+        Offset of each polygon into polygon_x and polygon_y [n_faces + 1]
+    """
+    valid = _valid_face_nodes(Mesh2_face_nodes, fill_value)
+
+    # Closing vertex is an extra (valid) column of first vertices
+    if closed:
+        valid = np.concatenate((valid, valid[:, :1]), axis=1)
+        face_nodes = np.concatenate((Mesh2_face_nodes, Mesh2_face_nodes[:, :1]), axis=1)
+    else:
+        face_nodes = Mesh2_face_nodes
+
+    # Row major selection keeps each face's vertices in order, with the
+    # closing vertex last
+    node_index = face_nodes[valid].astype(int)
+    offsets = np.zeros(valid.shape[0] + 1, dtype=int)
+    np.cumsum(valid.sum(axis=1), out=offsets[1:])
+
+    return Mesh2_node_x[node_index], Mesh2_node_y[node_index], offsets
+
+
+def close_polygons(
+                    face_nodes : np.ndarray,
+                    fill_value=None,
+) -> np.ndarray:
+    """Pads the face nodes of each polygon (face) with its first node
+    to form closed polygons, after replacing fill values with the
+    last valid node of the face
+    Parameters
+    ----------
+    face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    fill_value : int, optional
+        Value of padded face node entries
 
     Returns
     -------
-    polygon_x_pad : np.ndarray
-        polygon_x padded to form a closed polygon
-    polygon_y_pad : np.ndarray
-        polygon_y padded to form a closed polygon
+    face_nodes_pad : np.ndarray
+        face_nodes padded to form closed polygons
+        [n_faces x n_max_face_nodes + 1]
     """
-    face_nodes_pad = np.pad(face_nodes, (0, 1), 'wrap')[:-1]
+    face_nodes = _fill_face_nodes(face_nodes, fill_value)
+    face_nodes_pad = np.concatenate((face_nodes, face_nodes[:, :1]), axis=1)
 
     return face_nodes_pad
 
 
+def _valid_face_nodes(face_nodes, fill_value=None):
+    """Mask of face node entries that index real nodes, excluding
+    negative, NaN and fill value entries"""
+    valid = face_nodes >= 0
+    if fill_value is not None:
+        valid &= face_nodes != fill_value
+    return valid
+
+
+def _fill_face_nodes(face_nodes, fill_value=None):
+    """Replaces fill value entries of each face with its last
+    valid node"""
+    valid = _valid_face_nodes(face_nodes, fill_value)
+    if valid.all():
+        return face_nodes.astype(int)
+
+    # Column of the last valid entry at or before each entry
+    columns = np.where(valid, np.arange(face_nodes.shape[1]), 0)
+    np.maximum.accumulate(columns, axis=1, out=columns)
+    rows = np.arange(face_nodes.shape[0])[:, np.newaxis]
+    return np.where(valid, face_nodes, face_nodes[rows, columns]).astype(int)
+
+
 
 def minmax_Longitude_rad(v1, v2):
     """Quantitative method to find the minimum and maximum Longitude between in a great circle
@@ -72,6 +166,97 @@ def minmax_Longitude_rad(v1, v2):
 
 
 
+def minmax_Longitude_rad_batch(edges: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Batched minmax_Longitude_rad, finding the minimum and maximum
+    Longitude of every great circle arc at once
+    Parameters
+    ----------
+    edges: float array
+        Endpoints of each great circle arc [n_edges x 2 x 2], with the
+        last axis holding [lon, lat] in degree east
+    Returns
+    -------
+    lon_min : float array
+        Start longitude of each arc [n_edges]
+    lon_max : float array
+        End longitude of each arc [n_edges], less than lon_min when the
+        arc wraps across +-180 (a span of more than 180 degree)
+    """
+    lon_0 = edges[:, 0, 0]
+    lon_1 = edges[:, 1, 0]
+
+    # Reorder the two end points so the span of their longitude is less than 180 degree
+    start_lon = np.minimum(lon_0, lon_1)
+    end_lon = np.maximum(lon_0, lon_1)
+    swap = end_lon - start_lon > 180
+
+    lon_min = np.where(swap, end_lon, start_lon)
+    lon_max = np.where(swap, start_lon, end_lon)
+    return lon_min, lon_max
+
+
+def face_lonlat_bounds(
+        Mesh2_node_x: np.ndarray,
+        Mesh2_node_y: np.ndarray,
+        Mesh2_face_nodes: np.ndarray,
+        fill_value=None
+) -> np.ndarray:
+    """Reduces the bounds of every face edge (great circle arc) into
+    a lon/lat bounding box per face, for spatial indexing and
+    viewport culling
+    Parameters
+    ----------
+    Mesh2_node_x : np.ndarray
+        Longitude of each node in degree east
+    Mesh2_node_y : np.ndarray
+        Latitude of each node in degree north
+    Mesh2_face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    fill_value : int, optional
+        Value of padded face node entries
+
+    Returns
+    -------
+    bounds : np.ndarray
+        [lon_min, lat_min, lon_max, lat_max] of each face in degree
+        [n_faces x 4], with lon_min greater than lon_max for faces
+        crossing the antimeridian, and [-180, 180] longitude for faces
+        containing a pole
+    """
+    n_faces = Mesh2_face_nodes.shape[0]
+    edges, edge_face = _face_edges(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes, fill_value)
+    lon_min, lon_max = minmax_Longitude_rad_batch(edges)
+    crossing = lon_min > lon_max
+
+    # Arcs bulge poleward, so include each arc's latitude extremes
+    edge_lat_min, edge_lat_max = _arc_latitude_bounds(edges)
+
+    # Reduce each face's edges (edges are grouped by face)
+    face_start = np.zeros(n_faces, dtype=int)
+    np.cumsum(np.bincount(edge_face, minlength=n_faces)[:-1], out=face_start[1:])
+    bounds = np.empty((n_faces, 4))
+    bounds[:, 1] = np.minimum.reduceat(edge_lat_min, face_start)
+    bounds[:, 3] = np.maximum.reduceat(edge_lat_max, face_start)
+
+    # Faces crossing the antimeridian are bounded on [0, 360) and wrapped back
+    n_crossings = np.bincount(edge_face[crossing], minlength=n_faces)
+    lon_360 = np.where(n_crossings[edge_face] > 0, edges[:, 0, 0] % 360, edges[:, 0, 0])
+    lon_min = np.minimum.reduceat(lon_360, face_start)
+    lon_max = np.maximum.reduceat(lon_360, face_start)
+    bounds[:, 0] = np.where(lon_min < 180, lon_min, lon_min - 360)
+    bounds[:, 2] = np.where(lon_max <= 180, lon_max, lon_max - 360)
+
+    # Faces containing a pole cross the antimeridian once, and span every longitude
+    pole = n_crossings % 2 == 1
+    north = np.add.reduceat(edges[:, 0, 1], face_start) > 0
+    bounds[pole, 0] = -180.0
+    bounds[pole, 2] = 180.0
+    bounds[pole & north, 3] = 90.0
+    bounds[pole & ~north, 1] = -90.0
+
+    return bounds
+
+
 def construct_mesh(self):
     """ Constructs a Polygon Mesh using the calculated
     polygon array and drop index for cyclic polygons
@@ -222,9 +407,140 @@ def create_polygon_array(x, y):
     return polygon_array, new_poly_index
 
 
-def find_antimeridian_faces():
-    # for each face, find any segment that intersects the antimeridian
-    pass
+def find_antimeridian_faces(
+        Mesh2_node_x: np.ndarray,
+        Mesh2_node_y: np.ndarray,
+        Mesh2_face_nodes: np.ndarray,
+        fill_value=None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Finds the faces with an edge crossing the antimeridian, evaluating
+    every face edge at once. An edge crosses when the longitude span of
+    its great circle arc, as ordered by minmax_Longitude_rad, wraps
+    across +-180 degrees (so large polar faces are not misclassified
+    by sign changes). Vertices on +-180 are kept on the side of the
+    rest of their face, so faces touching the antimeridian do not cross it
+    Parameters
+    ----------
+    Mesh2_node_x : np.ndarray
+        Longitude of each node in degree east
+    Mesh2_node_y : np.ndarray
+        Latitude of each node in degree north
+    Mesh2_face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    fill_value : int, optional
+        Value of padded face node entries
+
+    Returns
+    -------
+    antimeridian_faces : np.ndarray
+        Boolean mask of faces crossing the antimeridian [n_faces]
+    crossing_points : np.ndarray
+        [lon, lat] in degree of each crossing of the antimeridian
+        [n_crossings x 2]
+    crossing_faces : np.ndarray
+        Face index of each crossing [n_crossings], faces containing a
+        pole cross once and all other crossing faces twice
+    """
+    n_faces = Mesh2_face_nodes.shape[0]
+    edges, edge_face = _face_edges(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes, fill_value)
+
+    # Arcs spanning more than 180 degrees of longitude wrap across +-180
+    lon_min, lon_max = minmax_Longitude_rad_batch(edges)
+    crossing = lon_min > lon_max
+    crossing_faces = edge_face[crossing]
+
+    # Intersection of each great circle with the meridian plane (y = 0),
+    # on the antimeridian side (x < 0)
+    a = _lonlat_to_xyz(edges[crossing, 0, 0], edges[crossing, 0, 1])
+    b = _lonlat_to_xyz(edges[crossing, 1, 0], edges[crossing, 1, 1])
+    normal = np.cross(a, b)
+    point_x = -normal[:, 2]
+    point_z = normal[:, 0]
+    flip = point_x > 0
+    point_x[flip] = -point_x[flip]
+    point_z[flip] = -point_z[flip]
+
+    crossing_points = np.empty((crossing_faces.shape[0], 2))
+    crossing_points[:, 0] = 180.0
+    crossing_points[:, 1] = np.rad2deg(np.arctan2(point_z, -point_x))
+
+    antimeridian_faces = np.bincount(crossing_faces, minlength=n_faces) > 0
+
+    return antimeridian_faces, crossing_points, crossing_faces
+
+
+def _face_edges(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes, fill_value=None):
+    """Endpoints of every face edge [n_edges x 2 x 2] ([lon, lat] in
+    degree, longitude wrapped by _wrap_face_longitude), grouped by face,
+    and the face of each edge"""
+    lon, lat, offsets = ugrid_to_ragged_polygon_coords(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes,
+                                                       fill_value=fill_value, closed=True)
+    lon = _wrap_face_longitude(lon, offsets)
+
+    # Each vertex except the closing vertex starts an edge
+    edge_start = np.ones(lon.shape[0], dtype=bool)
+    edge_start[offsets[1:] - 1] = False
+    edge_start = np.flatnonzero(edge_start)
+    edge_face = np.repeat(np.arange(offsets.shape[0] - 1), np.diff(offsets) - 1)
+
+    edges = np.empty((edge_start.shape[0], 2, 2))
+    edges[:, 0, 0] = lon[edge_start]
+    edges[:, 0, 1] = lat[edge_start]
+    edges[:, 1, 0] = lon[edge_start + 1]
+    edges[:, 1, 1] = lat[edge_start + 1]
+    return edges, edge_face
+
+
+def _wrap_face_longitude(lon, offsets):
+    """Wraps longitude to [-180, 180), except that vertices on the
+    antimeridian of faces with only positive longitudes otherwise
+    become +180 (so a face touching +-180 from either side does not
+    cross it)"""
+    lon = (lon + 180) % 360 - 180
+    antimeridian = lon == -180
+    positive = np.logical_or.reduceat(lon > 0, offsets[:-1])
+    negative = np.logical_or.reduceat((lon < 0) & ~antimeridian, offsets[:-1])
+    positive_face = np.repeat(positive & ~negative, np.diff(offsets))
+    lon[antimeridian & positive_face] = 180.0
+    return lon
+
+
+def _arc_latitude_bounds(edges):
+    """Minimum and maximum latitude of each great circle arc, including
+    the arc's poleward extreme when it lies between the end points"""
+    lon = np.deg2rad(edges[:, :, 0])
+    lat = np.deg2rad(edges[:, :, 1])
+    x = np.cos(lat) * np.cos(lon)
+    y = np.cos(lat) * np.sin(lon)
+    z = np.sin(lat)
+
+    # Normal of each great circle, a x b
+    n_x = y[:, 0] * z[:, 1] - z[:, 0] * y[:, 1]
+    n_y = z[:, 0] * x[:, 1] - x[:, 0] * z[:, 1]
+    n_z = x[:, 0] * y[:, 1] - y[:, 0] * x[:, 1]
+    norm = np.sqrt(n_x**2 + n_y**2 + n_z**2)
+
+    # The highest point of the great circle lies on the arc when the
+    # tangents at both end points, n x a and b x n, point north
+    # (and the lowest point when both point south)
+    tangent_a = n_x * y[:, 0] - n_y * x[:, 0]
+    tangent_b = x[:, 1] * n_y - y[:, 1] * n_x
+    valid = norm > 1e-12
+
+    lat_min = np.minimum(edges[:, 0, 1], edges[:, 1, 1])
+    lat_max = np.maximum(edges[:, 0, 1], edges[:, 1, 1])
+    north = np.flatnonzero(valid & (tangent_a > 0) & (tangent_b > 0))
+    south = np.flatnonzero(valid & (tangent_a < 0) & (tangent_b < 0))
+    lat_max[north] = np.maximum(lat_max[north], np.rad2deg(np.arccos(np.minimum(np.abs(n_z[north]) / norm[north], 1))))
+    lat_min[south] = np.minimum(lat_min[south], -np.rad2deg(np.arccos(np.minimum(np.abs(n_z[south]) / norm[south], 1))))
+    return lat_min, lat_max
+
+
+def _lonlat_to_xyz(lon, lat):
+    """Unit sphere coordinates [n x 3] of lon/lat points in degree"""
+    lon = np.deg2rad(lon)
+    lat = np.deg2rad(lat)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
 
 
 def split_antimeridian_faces():
@@ -232,8 +548,86 @@ def split_antimeridian_faces():
     pass
 
 
-def mpl_polygons():
-    pass
+class FacePolyCollection(PolyCollection):
+    """PolyCollection of mesh faces, where faces crossing the
+    antimeridian are drawn twice (once on each side); set_array takes
+    one value per face and maps it onto every drawn polygon, so new
+    values never rebuild the paths"""
+
+    def __init__(self, verts, face_index=None, **kwargs):
+        self.face_index = face_index
+        super().__init__(verts, **kwargs)
+
+    def set_array(self, A):
+        if A is not None and self.face_index is not None:
+            A = np.take(A, self.face_index)
+        super().set_array(A)
+
+
+def mpl_polygons(
+        Mesh2_node_x: np.ndarray,
+        Mesh2_node_y: np.ndarray,
+        Mesh2_face_nodes: np.ndarray,
+        face_values=None,
+        fill_value=None,
+        **kwargs
+) -> FacePolyCollection:
+    """Builds a matplotlib PolyCollection of every face directly from
+    a contiguous [n_faces x n_max_face_nodes x 2] vertex array, with
+    faces crossing the antimeridian shifted to be contiguous and
+    repeated 360 degree to the west
+    Parameters
+    ----------
+    Mesh2_node_x : np.ndarray
+        Longitude of each node in degree east
+    Mesh2_node_y : np.ndarray
+        Latitude of each node in degree north
+    Mesh2_face_nodes : np.ndarray
+        Node index of each face vertex [n_faces x n_max_face_nodes]
+    face_values : np.ndarray, optional
+        Value of each face [n_faces], mapped to colors with the
+        collection's cmap and norm
+    fill_value : int, optional
+        Value of padded face node entries
+    **kwargs
+        Passed on to PolyCollection (cmap, norm, edgecolors, ...)
+
+    Returns
+    -------
+    collection : FacePolyCollection
+        Polygons in [-180, 180] longitude (clip with the axes limits);
+        update the values of later timesteps with
+        collection.set_array(face_values)
+    """
+    polygon_x, polygon_y = ugrid_to_polygon_coords(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes, fill_value)
+    n_faces, n_nodes = polygon_x.shape
+
+    antimeridian_faces, _, _ = find_antimeridian_faces(Mesh2_node_x, Mesh2_node_y, Mesh2_face_nodes, fill_value)
+    crossing_faces = np.flatnonzero(antimeridian_faces)
+    n_crossing = crossing_faces.shape[0]
+
+    # Single preallocated vertex array, with the western copy of each
+    # crossing face after the faces themselves
+    verts = np.empty((n_faces + n_crossing, n_nodes, 2))
+    verts[:n_faces, :, 0] = _wrap_face_longitude(polygon_x.ravel(),
+                                                 np.arange(0, n_faces * n_nodes + 1, n_nodes)).reshape(n_faces, n_nodes)
+    verts[:n_faces, :, 1] = polygon_y
+
+    # Crossing faces are made contiguous east of 180 degree
+    crossing = verts[crossing_faces]
+    crossing[:, :, 0] = np.where(crossing[:, :, 0] < 0, crossing[:, :, 0] + 360, crossing[:, :, 0])
+    verts[crossing_faces] = crossing
+    verts[n_faces:] = crossing
+    verts[n_faces:, :, 0] -= 360
+
+    face_index = None
+    if n_crossing:
+        face_index = np.concatenate((np.arange(n_faces), crossing_faces))
+
+    collection = FacePolyCollection(verts, face_index=face_index, **kwargs)
+    if face_values is not None:
+        collection.set_array(face_values)
+    return collection
 
 
 def holoviz_polygons():
@@ -0,0 +1,143 @@
+import os
+import numpy as np
+import xarray as xr
+import pytest
+
+from helpers import find_antimeridian_faces, minmax_Longitude_rad, mpl_polygons
+
+data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'misc', 'data'))
+
+
+def open_ugrid(name):
+    ds = xr.open_dataset(os.path.join(data_path, name))
+    return ds['Mesh2_node_x'].values, ds['Mesh2_node_y'].values, ds['Mesh2_face_nodes'].values
+
+
+def open_exodus(name):
+    # Cartesian nodes on the unit sphere and 1-based connectivity blocks,
+    # padded with -1 into a single face node array
+    ds = xr.open_dataset(os.path.join(data_path, name))
+    x, y, z = ds['coord'].values
+    lon = np.rad2deg(np.arctan2(y, x))
+    lat = np.rad2deg(np.arcsin(z / np.sqrt(x**2 + y**2 + z**2)))
+
+    blocks = [ds[var].values - 1 for var in ds.data_vars if var.startswith('connect')]
+    face_nodes = np.full((sum(block.shape[0] for block in blocks), max(block.shape[1] for block in blocks)), -1)
+    start = 0
+    for block in blocks:
+        face_nodes[start:start + block.shape[0], :block.shape[1]] = block
+        start += block.shape[0]
+    return lon, lat, face_nodes
+
+
+grids = {'outCSne30.ug': lambda: open_ugrid('outCSne30.ug'),
+         'ov_RLL10deg_CSne4.ug': lambda: open_ugrid('ov_RLL10deg_CSne4.ug'),
+         'mixed.exo': lambda: open_exodus('mixed.exo')}
+
+
+def face_edges(node_x, node_y, face_nodes):
+    """Edges of each face as ([lon, lat], [lon, lat]) pairs, longitude
+    wrapped to [-180, 180) except for vertices on the antimeridian of
+    faces lying east of it (+180), in face and ring order"""
+    for face, nodes in enumerate(face_nodes):
+        nodes = nodes[nodes >= 0].astype(int)
+        lon = [(node_x[node] + 180) % 360 - 180 for node in nodes]
+        if max(lon) > 0 and not any(-180 < value < 0 for value in lon):
+            lon = [180.0 if value == -180 else value for value in lon]
+        for i, j in zip(range(len(nodes)), np.roll(range(len(nodes)), -1)):
+            yield face, [lon[i], node_y[nodes[i]]], [lon[j], node_y[nodes[j]]]
+
+
+def arc_latitudes(v1, v2, n_samples=101):
+    """Latitude of points along the great circle arc from v1 to v2"""
+    lon, lat = np.deg2rad([v1[0], v2[0]]), np.deg2rad([v1[1], v2[1]])
+    xyz = np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+    t = np.linspace(0, 1, n_samples)[:, np.newaxis]
+    points = xyz[0] * (1 - t) + xyz[1] * t
+    return np.rad2deg(np.arcsin(points[:, 2] / np.linalg.norm(points, axis=1)))
+
+
+@pytest.fixture(params=list(grids))
+def grid(request):
+    return grids[request.param]()
+
+
+def test_mask_matches_scalar_minmax(grid):
+    node_x, node_y, face_nodes = grid
+    mask, _, crossing_faces = find_antimeridian_faces(node_x, node_y, face_nodes)
+
+    expected_mask = np.zeros(face_nodes.shape[0], dtype=bool)
+    expected_faces = []
+    for face, v1, v2 in face_edges(node_x, node_y, face_nodes):
+        lon_min, lon_max = minmax_Longitude_rad(v1, v2)
+        if lon_min > lon_max:
+            expected_mask[face] = True
+            expected_faces.append(face)
+
+    np.testing.assert_array_equal(mask, expected_mask)
+    np.testing.assert_array_equal(crossing_faces, expected_faces)
+
+
+def test_crossings_per_face(grid):
+    node_x, node_y, face_nodes = grid
+    mask, _, crossing_faces = find_antimeridian_faces(node_x, node_y, face_nodes)
+    n_crossings = np.bincount(crossing_faces, minlength=face_nodes.shape[0])
+
+    # A face winds once around a pole it contains, and crosses the antimeridian
+    # once. A face with a vertex on a pole (of arbitrary longitude) crosses it
+    # once or twice
+    winding = np.zeros(face_nodes.shape[0])
+    on_pole = np.zeros(face_nodes.shape[0], dtype=bool)
+    for face, v1, v2 in face_edges(node_x, node_y, face_nodes):
+        winding[face] += (v2[0] - v1[0] + 180) % 360 - 180
+        on_pole[face] |= np.isclose(abs(v1[1]), 90)
+    pole = np.isclose(np.abs(winding), 360) & ~on_pole
+
+    assert np.all(n_crossings[mask & pole] == 1)
+    assert np.all(np.isin(n_crossings[mask & on_pole], [1, 2]))
+    assert np.all(n_crossings[mask & ~pole & ~on_pole] == 2)
+    assert np.all(n_crossings[~mask] == 0)
+
+
+def test_crossing_point_latitudes(grid):
+    node_x, node_y, face_nodes = grid
+    _, crossing_points, _ = find_antimeridian_faces(node_x, node_y, face_nodes)
+
+    crossing_edges = []
+    for _, v1, v2 in face_edges(node_x, node_y, face_nodes):
+        lon_min, lon_max = minmax_Longitude_rad(v1, v2)
+        if lon_min > lon_max:
+            crossing_edges.append((v1, v2))
+
+    assert crossing_points.shape == (len(crossing_edges), 2)
+    np.testing.assert_array_equal(crossing_points[:, 0], 180.0)
+    for (v1, v2), lat in zip(crossing_edges, crossing_points[:, 1]):
+        # Between the end point latitudes, widened by the poleward bulge of the arc
+        latitudes = arc_latitudes(v1, v2)
+        assert min(v1[1], v2[1], latitudes.min()) - 1e-9 <= lat <= max(v1[1], v2[1], latitudes.max()) + 1e-9
+
+
+@pytest.mark.parametrize('node_x, crossing', [
+    ([170, 180, 180, 170], False),
+    ([-170, -180, -180, -170], False),
+    ([170, -180, -180, 170], False),
+    ([-170, 180, 180, -170], False),
+    ([190, 180, 180, 190], False),
+    ([170, 190, 190, 170], True),
+    ([170, -170, -170, 170], True),
+    ([170, 180, -170, -170], True),
+])
+def test_touching_faces(node_x, crossing):
+    # Faces touching the antimeridian from either side do not cross it
+    node_x = np.array(node_x, dtype=float)
+    node_y = np.array([0.0, 0.0, 10.0, 10.0])
+    face_nodes = np.array([[0, 1, 2, 3]])
+    mask, crossing_points, _ = find_antimeridian_faces(node_x, node_y, face_nodes)
+
+    assert mask[0] == crossing
+    assert crossing_points.shape[0] == (2 if crossing else 0)
+
+    # Only crossing faces get a second, wrapped polygon
+    collection = mpl_polygons(node_x, node_y, face_nodes, np.zeros(1))
+    assert len(collection.get_paths()) == (2 if crossing else 1)
+    assert np.ptp(collection.get_paths()[0].vertices[:, 0]) <= 20